@@ -1,6 +1,6 @@
 {
     'name': 'Real Estate Management',
-    'version': '1.1',
+    'version': '1.3',
     'license': 'LGPL-3',
     'category': 'Website',
     'summary': 'Module for managing real estate properties and website integration',
@@ -15,6 +15,7 @@
         'data/mail_property_rejection.xml',
         'data/sequences.xml',
         'data/agent_registration_demo.xml',
+        'data/ir_cron.xml',
 
         # Views
         'views/property_views.xml',
@@ -23,15 +24,18 @@
         'views/property_registration_views.xml',
         'views/agent_views.xml',
         'views/agent_registration_views.xml',
+        'views/agent_ledger_views.xml',
+        'views/ai_cache_views.xml',
         # 'views/portal_agent_views.xml',
 
         # Qweb Templates
+        'views/qweb_templates/property_card_templates.xml',
         'views/qweb_templates/property_map_template.xml',
         'views/qweb_templates/property_detail_page.xml',
         'views/qweb_templates/properties_menu_page.xml',
         'views/qweb_templates/website_registration_template.xml',
-        # 'views/qweb_templates/agent_directory_template.xml',
-        # 'views/qweb_templates/agent_detail_template.xml',
+        'views/qweb_templates/agent_directory_template.xml',
+        'views/qweb_templates/agent_detail_template.xml',
         'views/qweb_templates/agent_registration_form_template.xml',
         'views/qweb_templates/agent_no_access.xml',
         'views/qweb_templates/agent_portal_dashboard.xml',
@@ -43,6 +47,7 @@
 
         #wizards
         'wizard/agent_registration_reject_wizard_views.xml',
+        'wizard/property_import_wizard_views.xml',
 
     ],
     'assets': {
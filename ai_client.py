@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""Shared HTTP client for the AI content provider.
+
+One pooled ``requests`` session per worker keeps connections to the provider
+alive between calls. Every call has an overall deadline; only failures that
+are safe to repeat are retried (the connection could not be opened, or the
+provider answered 429/5xx), with jittered exponential backoff. A circuit
+breaker opens after consecutive failures so that, while the provider is
+down, callers fail immediately and keep serving the content they already
+have instead of holding page views for the full timeout.
+"""
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+import logging
+
+from . import instrumentation
+
+_logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+CONNECT_TIMEOUT = 3.05
+
+
+class AIClientError(Exception):
+    pass
+
+
+class CircuitOpenError(AIClientError):
+    pass
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` consecutive failures; after
+    ``reset_timeout`` seconds one trial call is let through (half-open) and
+    its outcome closes or re-opens the circuit."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return 'closed'
+        return 'half_open' if time.monotonic() - self._opened_at >= self.reset_timeout else 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    _logger.warning("AI provider circuit opened after %s consecutive failures", self._failures)
+                self._opened_at = time.monotonic()
+
+
+class AIHttpClient:
+
+    def __init__(self, name, pool_size=10, max_attempts=3, backoff=0.5, failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.session = requests.Session()
+        # Retries are handled below, the adapter only pools connections
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def post_json(self, url, payload, headers=None, deadline=15.0):
+        """POST ``payload`` as JSON and return the decoded JSON answer.
+
+        :param deadline: seconds for the whole call, retries and backoff included
+        :raise CircuitOpenError: the provider is considered down, nothing was sent
+        :raise AIClientError: the call failed
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+        give_up_at = time.monotonic() + deadline
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                with instrumentation.timed('external', self.name, count_queries=False) as call:
+                    response = self.session.post(url, json=payload, headers=headers,
+                                                 timeout=(min(CONNECT_TIMEOUT, remaining), remaining))
+                    call.failed = response.status_code != 200
+            except requests.ConnectionError as e:
+                # ConnectTimeout is a ConnectionError too: nothing reached the provider
+                error = f"connection failed: {e}"
+            except requests.Timeout as e:
+                # Read timeout: the request reached the provider, repeating it is not safe
+                self.breaker.record_failure()
+                raise AIClientError(f"{self.name} timed out") from e
+            except requests.RequestException as e:
+                self.breaker.record_failure()
+                raise AIClientError(f"{self.name} request failed: {e}") from e
+            else:
+                if response.status_code == 200:
+                    try:
+                        data = response.json()
+                    except ValueError as e:
+                        self.breaker.record_failure()
+                        raise AIClientError(f"{self.name} returned invalid JSON") from e
+                    self.breaker.record_success()
+                    return data
+                if response.status_code not in RETRYABLE_STATUSES:
+                    # Client errors (bad key, bad request) say nothing about the provider's health
+                    self.breaker.record_success()
+                    raise AIClientError(f"{self.name} returned {response.status_code}: {response.text[:200]}")
+                error = f"status {response.status_code}"
+
+            if attempt < self.max_attempts:
+                delay = self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                time.sleep(max(0.0, min(delay, give_up_at - time.monotonic())))
+
+        self.breaker.record_failure()
+        raise AIClientError(f"{self.name} failed after {attempt} attempt(s): {error or 'deadline exceeded'}")
+
+
+groq_client = AIHttpClient('groq')
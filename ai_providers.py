@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""AI content providers.
+
+The provider is chosen with the ``real_estate_management.ai_provider``
+system parameter:
+
+- ``groq`` (default): the Groq chat completions API, through the pooled
+  client of ``ai_client``. ``real_estate_management.ai_url`` and
+  ``real_estate_management.ai_model`` override the endpoint and the model.
+- ``stub``: a local stand-in answering deterministic JSON for the keys the
+  prompt asks for, with a configurable latency
+  (``real_estate_management.ai_stub_latency_ms``) and rates of failures
+  (``..._failure_rate``) and malformed answers (``..._malformed_rate``), to
+  load test the AI pipeline, its cache and its circuit breaker offline.
+"""
+import hashlib
+import itertools
+import json
+import random
+import re
+import time
+
+from . import instrumentation
+from .ai_client import AIClientError, CircuitBreaker, CircuitOpenError, groq_client
+
+GROQ_URL = 'https://api.groq.com/openai/v1/chat/completions'
+GROQ_MODEL = 'llama-3.3-70b-versatile'  # FREE Groq model
+
+PARAMETERS = (
+    'groq.api_key',
+    'real_estate_management.ai_provider',
+    'real_estate_management.ai_url',
+    'real_estate_management.ai_model',
+    'real_estate_management.ai_stub_latency_ms',
+    'real_estate_management.ai_stub_failure_rate',
+    'real_estate_management.ai_stub_malformed_rate',
+)
+_PROMPT_KEY = re.compile(r'^\s*-\s*([a-z_]+)\b', re.MULTILINE)
+
+
+class AIProvider:
+    """Base class: ``complete`` returns the raw text answered to ``messages``"""
+    name = None
+    default_model = None
+    breaker = None
+
+    def __init__(self, params):
+        self.params = params
+        self.model = params.get('real_estate_management.ai_model') or self.default_model
+
+    @property
+    def cache_namespace(self):
+        return f'{self.name}:{self.model}'
+
+    def is_configured(self):
+        return True
+
+    def complete(self, messages, max_tokens, temperature, deadline):
+        """:raise AIClientError: the call failed (CircuitOpenError: not attempted)"""
+        raise NotImplementedError
+
+
+class GroqProvider(AIProvider):
+    name = 'groq'
+    default_model = GROQ_MODEL
+    breaker = groq_client.breaker
+
+    def is_configured(self):
+        return bool(self.params.get('groq.api_key'))
+
+    def complete(self, messages, max_tokens, temperature, deadline):
+        response_data = groq_client.post_json(
+            self.params.get('real_estate_management.ai_url') or GROQ_URL,
+            {'model': self.model, 'messages': messages, 'max_tokens': max_tokens, 'temperature': temperature},
+            headers={'Authorization': f"Bearer {self.params['groq.api_key']}"},
+            deadline=deadline,
+        )
+        try:
+            return response_data['choices'][0]['message']['content'].strip()
+        except (KeyError, IndexError, TypeError) as e:
+            raise AIClientError(f"Unexpected Groq answer: {e!r}") from e
+
+
+class StubProvider(AIProvider):
+    name = 'stub'
+    default_model = 'stub-1'
+    breaker = CircuitBreaker()
+    _calls = itertools.count()
+
+    def _rate(self, key):
+        return float(self.params.get(f'real_estate_management.ai_stub_{key}') or 0)
+
+    def complete(self, messages, max_tokens, temperature, deadline):
+        if not self.breaker.allow():
+            raise CircuitOpenError("stub is unavailable (circuit open)")
+        prompt = messages[-1]['content']
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+        # Answers depend on the prompt only; failures follow a seeded call sequence
+        rng = random.Random(next(self._calls))
+        with instrumentation.timed('external', self.name, count_queries=False) as call:
+            latency = float(self.params.get('real_estate_management.ai_stub_latency_ms') or 200) / 1000
+            time.sleep(min(latency * rng.uniform(0.5, 1.5), deadline))
+            if latency > deadline:
+                call.failed = True
+            elif rng.random() < self._rate('failure_rate'):
+                call.failed = True
+        if call.failed:
+            self.breaker.record_failure()
+            raise AIClientError("stub: simulated failure or timeout")
+        self.breaker.record_success()
+
+        answer = {
+            key: [f"{key.replace('_', ' ').capitalize()} {i} ({digest[i * 6:i * 6 + 6]})" for i in range(1, 4)]
+            for key in _PROMPT_KEY.findall(prompt)
+        }
+        text = json.dumps(answer)
+        if rng.random() < self._rate('malformed_rate'):
+            return f"```json\n{text[:len(text) // 2]}"
+        return f"```json\n{text}\n```" if int(digest[0], 16) % 2 else text
+
+
+PROVIDERS = {provider.name: provider for provider in (GroqProvider, StubProvider)}
+
+
+def get_provider(env):
+    """Return the provider configured for the database of ``env``"""
+    ICP = env['ir.config_parameter'].sudo()
+    params = {key: ICP.get_param(key) for key in PARAMETERS}
+    provider = PROVIDERS.get(params.get('real_estate_management.ai_provider') or 'groq', GroqProvider)
+    return provider(params)
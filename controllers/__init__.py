@@ -1,3 +1,8 @@
 from . import property_controller
 from . import agent_portal
-
+from . import page_cache
+from . import http_cache
+from . import feed
+from . import sitemap
+from . import metrics
+from . import heatmap
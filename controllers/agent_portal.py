@@ -5,6 +5,8 @@ from odoo.exceptions import AccessError
 import base64
 import logging
 
+from ..logging_utils import redact
+
 _logger = logging.getLogger(__name__)
 
 
@@ -33,7 +35,8 @@ class AgentPortalController(http.Controller):
             return request.render('real_estate_management.agent_no_access')
 
         # Get only THIS agent's properties
-        properties = request.env['property.property'].search([
+        # Include archived (long-sold) listings in the agent's history
+        properties = request.env['property.property'].with_context(active_test=False).search([
             ('agent_id', '=', agent.id)
         ], order='create_date desc')
 
@@ -71,7 +74,8 @@ class AgentPortalController(http.Controller):
         if not agent:
             return request.redirect('/my')
 
-        properties = request.env['property.property'].search([
+        # Include archived (long-sold) listings in the agent's history
+        properties = request.env['property.property'].with_context(active_test=False).search([
             ('agent_id', '=', agent.id)
         ], order='create_date desc')
 
@@ -89,11 +93,14 @@ class AgentPortalController(http.Controller):
         if not agent:
             return request.redirect('/my')
 
-        categories = request.env['property.category'].sudo().search([])
+        # Dropdown data is cached as (id, name) pairs
+        categories = request.env['property.category']._get_form_options()
+        states = request.env['res.country.state']._get_form_options(request.env.ref('base.in').id)
 
         return request.render('real_estate_management.agent_portal_add_property', {
             'agent': agent,
             'categories': categories,
+            'states': states,
             'error': kw.get('error'),
         })
 
@@ -166,15 +173,13 @@ class AgentPortalController(http.Controller):
             return request.redirect('/my')
 
         try:
-            _logger.info(f"=== Starting property submission for agent: {agent.name} ===")
-
             # Get uploaded files
             files = request.httprequest.files
             main_image = files.get('main_image')
             gallery_images = files.getlist('gallery_images')
 
-            _logger.info(f"POST data received: {list(post.keys())}")
-            _logger.info(f"Files received: main_image={main_image is not None}, gallery_count={len(gallery_images)}")
+            _logger.debug("Property submission by agent %s: fields=%s main_image=%s gallery_count=%s",
+                          agent.id, list(post), main_image is not None, len(gallery_images))
 
             # Get state from form or use agent's state
             state_id = post.get('state_id')
@@ -258,17 +263,17 @@ class AgentPortalController(http.Controller):
                     image_data = main_image.read()
                     if image_data:
                         property_vals['image'] = base64.b64encode(image_data)
-                        _logger.info("Main image uploaded successfully")
                 except Exception as img_err:
-                    _logger.error(f"Image upload error: {img_err}")
+                    _logger.error("Main image upload failed for agent %s: %s", agent.id, img_err)
 
-            _logger.info(f"Creating property with values: {property_vals}")
+            if _logger.isEnabledFor(logging.DEBUG):
+                _logger.debug("Creating property with values: %s", redact(property_vals))
 
             # Create property
             PropertyModel = request.env['property.property'].sudo()
             property_obj = PropertyModel.create(property_vals)
 
-            _logger.info(f"✅ Property created successfully: ID={property_obj.id}, Name={property_obj.name}")
+            _logger.info("Property %s submitted by agent %s", property_obj.id, agent.id)
 
             # Handle gallery images
             if gallery_images:
@@ -283,18 +288,14 @@ class AgentPortalController(http.Controller):
                                     'image': base64.b64encode(img_data),
                                     'name': img_file.filename,
                                 })
-                                _logger.info(f"Gallery image {idx + 1} uploaded: {img_file.filename}")
                         except Exception as gal_err:
-                            _logger.error(f"Gallery image {idx + 1} error: {gal_err}")
-
-            _logger.info("=== Property submission completed successfully ===")
+                            _logger.error("Gallery image %s upload failed for property %s: %s",
+                                          idx + 1, property_obj.id, gal_err)
 
             return request.redirect('/my/agent/properties?success=1')
 
-        except Exception as e:
-            _logger.exception(f"❌ CRITICAL ERROR in property submission")
-            _logger.error(f"Error type: {type(e).__name__}")
-            _logger.error(f"Error message: {str(e)}")
+        except Exception:
+            _logger.exception("Property submission failed for agent %s", agent.id)
 
             return request.redirect('/my/agent/property/add?error=1')
 
@@ -323,8 +324,6 @@ class AgentPortalController(http.Controller):
     def update_property_status(self, property_id=None, new_status=None, **kwargs):
         """Update property status - HTTP POST endpoint"""
         try:
-            _logger.info(f"📝 Status update request: property_id={property_id}, new_status={new_status}")
-
             # Validate inputs
             if not property_id or not new_status:
                 return request.make_json_response({
@@ -364,7 +363,7 @@ class AgentPortalController(http.Controller):
             old_status = property_obj.status
             property_obj.write({'status': new_status})
 
-            _logger.info(f"✅ Property '{property_obj.name}' status: {old_status} → {new_status} (Agent: {agent.name})")
+            _logger.info("Property %s status: %s -> %s (agent %s)", property_obj.id, old_status, new_status, agent.id)
 
             return request.make_json_response({
                 'success': True,
@@ -372,8 +371,8 @@ class AgentPortalController(http.Controller):
                 'new_status': new_status
             })
 
-        except Exception as e:
-            _logger.exception(f"❌ Error updating status: {e}")
+        except Exception:
+            _logger.exception("Status update failed for property %s", property_id)
             return request.make_json_response({
                 'success': False,
                 'message': 'An error occurred. Please try again.'
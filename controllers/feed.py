@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from odoo import http, fields
+from odoo.http import request, Response
+from odoo.tools import consteq
+import logging
+
+_logger = logging.getLogger(__name__)
+
+FEED_CONTENT_TYPES = {
+    'xml': 'application/xml; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class PropertyFeedController(http.Controller):
+
+    @http.route('/feed/properties.<any(xml, jsonl):fmt>', type='http', auth='public', methods=['GET'])
+    def property_feed(self, fmt, since=None, token=None, **kwargs):
+        """Syndication feed of published listings, streamed as XML or JSON lines.
+
+        ``since`` (UTC, ``YYYY-MM-DD HH:MM:SS``) limits the feed to listings
+        changed after that time; pass the previous response's X-Feed-Generated
+        header to sync incrementally.
+
+        ``token`` must match the ``real_estate_management.feed_token`` system
+        parameter; the feed does not exist while it is unset.
+        """
+        expected_token = request.env['ir.config_parameter'].sudo().get_param('real_estate_management.feed_token')
+        if not expected_token:
+            return request.not_found()
+        if not consteq(token or '', expected_token):
+            return Response('Invalid feed token', status=403)
+        if since:
+            try:
+                since = fields.Datetime.to_datetime(since)
+            except ValueError:
+                return Response('Invalid "since" date', status=400)
+
+        generated_at, body = request.env['real.estate.property.feed'].sudo().stream(fmt, since)
+        return Response(body, headers=[
+            ('Content-Type', FEED_CONTENT_TYPES[fmt]),
+            ('X-Feed-Generated', generated_at),
+            ('Cache-Control', 'no-store'),
+        ], direct_passthrough=True)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Price per sq.ft heatmap of the published listings.
+
+Listings are binned into square lat/lon cells whose size follows the map
+zoom (``HEATMAP_CELLS_PER_TILE`` cells across a map tile), with the count,
+median and mean price per sq.ft of each cell. Binning runs on the listing
+snapshot's columns (``listing_snapshot``) and falls back to a grouped SQL
+query without it. Results are kept per worker for each (city, zoom) until
+a property changes.
+"""
+import json
+
+from odoo import http
+from odoo.http import request
+from odoo.tools.lru import LRU
+
+from ..listing_snapshot import listing_snapshots
+from .page_cache import page_cache
+
+HEATMAP_MIN_ZOOM = 5
+HEATMAP_MAX_ZOOM = 16
+HEATMAP_CELLS_PER_TILE = 4
+
+_heatmap_cache = LRU(256)
+
+
+def _cell_size(zoom):
+    """Cell side in degrees: a map tile spans 360 / 2**zoom degrees of longitude"""
+    return 360.0 / (2 ** zoom * HEATMAP_CELLS_PER_TILE)
+
+
+class PropertyHeatmapController(http.Controller):
+
+    @staticmethod
+    def _grid_sql(cell_size, city):
+        cr = request.env.cr
+        cr.execute("""
+            SELECT floor(latitude / %(cell)s)::bigint AS cell_row,
+                   floor(longitude / %(cell)s)::bigint AS cell_column,
+                   count(*),
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY price_per_sqft),
+                   avg(price_per_sqft)
+              FROM property_property
+             WHERE is_published AND active
+               AND latitude != 0 AND longitude != 0 AND price_per_sqft > 0
+               AND (%(city)s IS NULL OR city = %(city)s)
+             GROUP BY cell_row, cell_column
+        """, {'cell': cell_size, 'city': city or None})
+        return cr.fetchall()
+
+    @http.route('/properties/heatmap', type='http', auth='public', methods=['GET'], website=True, sitemap=False)
+    def heatmap(self, zoom='12', city='', **kwargs):
+        """Cells of the price per sq.ft heatmap as JSON:
+        ``{"zoom", "cell_size", "cells": [{south, west, north, east, count, median, mean}]}``"""
+        zoom = min(max(int(zoom) if zoom.isdigit() else 12, HEATMAP_MIN_ZOOM), HEATMAP_MAX_ZOOM)
+        cell_size = _cell_size(zoom)
+        snapshot = listing_snapshots.get(request.env)
+        if snapshot is not None:
+            version = snapshot.tag_version
+        else:
+            version = page_cache.get_versions().get('property.property', 0)
+
+        key = (request.db, city, zoom, version)
+        body = _heatmap_cache.get(key)
+        if body is None:
+            if snapshot is not None:
+                grid = snapshot.grid(cell_size, city=city)
+            else:
+                grid = self._grid_sql(cell_size, city)
+            body = json.dumps({
+                'zoom': zoom,
+                'cell_size': cell_size,
+                'cells': [{
+                    'south': row * cell_size,
+                    'west': column * cell_size,
+                    'north': (row + 1) * cell_size,
+                    'east': (column + 1) * cell_size,
+                    'count': count,
+                    'median': round(median, 2),
+                    'mean': round(float(mean), 2),
+                } for row, column, count, median, mean in grid],
+            })
+            _heatmap_cache[key] = body
+        return request.make_response(body, headers=[
+            ('Content-Type', 'application/json'),
+            ('Cache-Control', 'public, max-age=60'),
+        ])
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""HTTP validators (ETag / Last-Modified) and Cache-Control for public pages.
+
+Validators are computed from the newest ``write_date`` of the records a page
+shows and from the cache tags it depends on, so a browser or reverse proxy
+revalidating an unchanged page gets a 304 after a few small queries, before
+anything is rendered.
+"""
+import hashlib
+from datetime import timezone
+
+from werkzeug.http import http_date
+
+from odoo.http import request
+
+from .page_cache import PROPERTY_PAGE_TAGS
+
+# Anonymous pages may be shared by proxies and served stale while they revalidate
+PUBLIC_CACHE_CONTROL = 'public, max-age=60, stale-while-revalidate=600'
+PRIVATE_CACHE_CONTROL = 'private, no-cache'
+
+
+def _read_tags(tags):
+    """({tag: version}, time of the latest bump) of cache tags, read from the
+    database rather than the per-worker snapshot"""
+    request.env.cr.execute("SELECT name, version, write_date FROM real_estate_cache_tag WHERE name = ANY(%s)",
+                           [list(tags)])
+    rows = request.env.cr.fetchall()
+    return {name: version for name, version, _date in rows}, max((date for *_tag, date in rows), default=None)
+
+
+def last_change(tags, *dates):
+    """Latest of ``dates`` and of the last bump of the cache ``tags``.
+
+    Deletions, unpublications and category renames leave the properties'
+    newest write_date unchanged; the tag bumps they cause do not.
+    """
+    _versions, bumped_at = _read_tags(tags)
+    return max(filter(None, [bumped_at, *dates]), default=None)
+
+
+def compute_validators(records_domain, tags=PROPERTY_PAGE_TAGS, extra=()):
+    """Return (etag, last_modified) for a page listing the records matching a domain.
+
+    :param records_domain: domain on property.property of the records shown
+    :param tags: cache tags the page depends on (see ``page_cache.put``);
+        their versions are folded into the ETag and their last bump into
+        Last-Modified
+    :param extra: additional values that change the page (e.g. the main record)
+    """
+    Property = request.env['property.property'].sudo()
+    [(last_modified, count)] = Property._read_group(
+        records_domain, aggregates=['write_date:max', '__count'])
+    versions, bumped_at = _read_tags(tags)
+    httprequest = request.httprequest
+    parts = (
+        request.db,
+        getattr(request, 'website', None) and request.website.id,
+        request.lang.code if request.lang else None,
+        # Logged-in and anonymous renderings of a page differ
+        request.env.uid,
+        httprequest.full_path,
+        last_modified,
+        count,
+        tuple(versions.get(tag, 0) for tag in tags),
+        *extra,
+    )
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    # Weak: cached bodies differ per session (CSRF token) but are equivalent
+    return f'W/"{digest}"', max(filter(None, [last_modified, bumped_at]), default=None)
+
+
+def not_modified(etag, last_modified):
+    """Return a 304 response if the client's copy is still valid, else None"""
+    httprequest = request.httprequest
+    if httprequest.if_none_match:
+        matched = httprequest.if_none_match.contains_weak(etag.removeprefix('W/').strip('"'))
+    elif httprequest.if_modified_since and last_modified:
+        # Only as good as last_modified: callers fold in the tag bumps (see last_change)
+        matched = last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= httprequest.if_modified_since
+    else:
+        matched = False
+    if not matched:
+        return None
+    return add_validators(request.make_response('', status=304), etag, last_modified)
+
+
+def add_validators(response, etag, last_modified):
+    response.headers['ETag'] = etag
+    if last_modified:
+        response.headers['Last-Modified'] = http_date(last_modified.replace(tzinfo=timezone.utc))
+    response.headers['Cache-Control'] = (
+        PUBLIC_CACHE_CONTROL if request.env.user._is_public() else PRIVATE_CACHE_CONTROL)
+    response.headers['Vary'] = 'Cookie, Accept-Language'
+    return response
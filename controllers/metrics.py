@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from odoo import http
+from odoo.http import request, Response
+from odoo.tools import consteq
+
+from .. import instrumentation
+from ..ai_providers import PROVIDERS
+from ..listing_snapshot import listing_snapshots
+from ..models.property import _card_cache
+from .page_cache import page_cache
+
+
+def _page_cache_stats(env):
+    return {(('stat', stat),): value for stat, value in page_cache.stats().items()}
+
+
+def _card_cache_size(env):
+    return {(): len(_card_cache)}
+
+
+def _listing_snapshot_stats(env):
+    return {(('stat', stat),): value for stat, value in listing_snapshots.stats().items()}
+
+
+def _queue_lengths(env):
+    cr = env.cr
+    cr.execute("SELECT count(*) FROM mail_mail WHERE state = 'outgoing'")
+    [outgoing_mails] = cr.fetchone()
+    cr.execute("SELECT count(*) FROM property_property WHERE geolocation_pending")
+    [pending_geocoding] = cr.fetchone()
+    return {
+        (('queue', 'outgoing_mail'),): outgoing_mails,
+        (('queue', 'geocoding'),): pending_geocoding,
+    }
+
+
+def _circuit_states(env):
+    return {(('client', name), ('state', state)): int(provider.breaker.state == state)
+            for name, provider in PROVIDERS.items() for state in ('closed', 'open', 'half_open')}
+
+
+instrumentation.registry.register_gauge(
+    'real_estate_page_cache', 'Full-page cache entries, size in bytes, hits and misses', _page_cache_stats)
+instrumentation.registry.register_gauge(
+    'real_estate_card_cache_entries', 'Rendered property cards held in cache', _card_cache_size)
+instrumentation.registry.register_gauge(
+    'real_estate_listing_snapshot', 'Rows and bytes held in the in-memory listing snapshot', _listing_snapshot_stats)
+instrumentation.registry.register_gauge(
+    'real_estate_queue_length', 'Work waiting in background queues', _queue_lengths)
+instrumentation.registry.register_gauge(
+    'real_estate_circuit_state', 'Circuit breaker state of external clients (1 for the current state)', _circuit_states)
+
+
+class RealEstateMetricsController(http.Controller):
+
+    @http.route('/real_estate/metrics', type='http', auth='public', methods=['GET'], save_session=False)
+    def metrics(self, **kwargs):
+        """Prometheus scrape endpoint, authenticated with a bearer token.
+
+        The token is the ``real_estate_management.metrics_token`` system
+        parameter; the endpoint does not exist while it is unset.
+        """
+        env = request.env(su=True)
+        token = env['ir.config_parameter'].get_param('real_estate_management.metrics_token')
+        if not token:
+            return request.not_found()
+        authorization = request.httprequest.headers.get('Authorization', '')
+        if not consteq(authorization, f'Bearer {token}'):
+            return Response('Unauthorized', status=401, headers=[('WWW-Authenticate', 'Bearer')])
+        return Response(instrumentation.registry.render(env), headers=[
+            ('Content-Type', 'text/plain; version=0.0.4; charset=utf-8'),
+            ('Cache-Control', 'no-store'),
+        ])
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""Per-worker full-page cache for anonymous visitors.
+
+Pages are keyed by website, language, path and query string and remember
+the version of each invalidation tag (see ``real.estate.cache.tag``) they
+were rendered with. Workers re-read the tag versions at most every
+``CHECK_INTERVAL`` seconds, so a cache hit costs no SQL at all and an edit
+reaches every worker within that interval.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from odoo.http import request
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Tags are model names: the models bump their own tag when they change.
+# Properties also bump 'property.property:category:<id>', which is all a
+# detail page depends on (see property.property._detail_cache_tags).
+PROPERTY_PAGE_TAGS = ('property.property', 'property.category')
+
+
+class PageCache:
+
+    CHECK_INTERVAL = 2.0  # seconds between tag version checks per worker
+    MAX_ENTRIES = 2000
+    MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._size = 0
+        self._versions = {}  # {dbname: (checked_at, {tag: version})}
+        self._lock = threading.RLock()
+        self.hits = self.misses = 0
+
+    # -------------------- request helpers --------------------
+    @staticmethod
+    def is_cacheable():
+        """Only plain anonymous GETs without per-visitor state are cached"""
+        httprequest = request.httprequest
+        if httprequest.method != 'GET' or not request.env.user._is_public():
+            return False
+        if request.session.debug or request.session.get('sale_order_id'):
+            return False
+        return not any(arg in httprequest.args for arg in ('enable_editor', 'edit_translations', 'debug'))
+
+    @staticmethod
+    def _make_key():
+        httprequest = request.httprequest
+        website = getattr(request, 'website', None)
+        return (
+            request.db,
+            website.id if website else None,
+            request.lang.code if request.lang else None,
+            httprequest.path,
+            tuple(sorted(httprequest.args.items(multi=True))),
+        )
+
+    def get_versions(self):
+        """Tag versions of the current database, re-read at most every CHECK_INTERVAL"""
+        now = time.monotonic()
+        checked_at, versions = self._versions.get(request.db, (0.0, {}))
+        if now - checked_at > self.CHECK_INTERVAL:
+            versions = request.env['real.estate.cache.tag'].sudo()._get_versions()
+            with self._lock:
+                self._versions[request.db] = (now, versions)
+        return versions
+
+    # -------------------- public API --------------------
+    def get(self, etag=None):
+        """Return a cached response for the current request, or None.
+
+        :param etag: the page's current ETag (see ``http_cache``): an entry
+            rendered under another one is stale, whatever the tag versions
+            this worker has seen so far
+        """
+        if not self.is_cacheable():
+            return None
+        key = self._make_key()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        versions = self.get_versions()
+        # Stale only if a tag moved past the version the page was rendered
+        # with (an entry may be newer than this worker's snapshot)
+        if (etag is not None and entry['etag'] != etag) or any(
+                versions.get(tag, 0) > version for tag, version in entry['versions'].items()):
+            with self._lock:
+                self._drop(key)
+            self.misses += 1
+            return None
+        with self._lock:
+            self._entries.move_to_end(key)
+        self.hits += 1
+
+        body = entry['body']
+        if entry['csrf_token']:
+            # The page was rendered for another session: hand out this visitor's token
+            body = body.replace(entry['csrf_token'], request.csrf_token().encode())
+        return request.make_response(body, headers=[
+            ('Content-Type', entry['content_type']),
+            ('X-Page-Cache', 'HIT'),
+        ])
+
+    def put(self, response, tags=PROPERTY_PAGE_TAGS, etag=None):
+        """Store a freshly rendered response and return it
+
+        :param etag: ETag computed in the rendering transaction, required
+            from ``get`` to serve the entry
+        """
+        if not self.is_cacheable() or response.status_code != 200:
+            return response
+        # Read tag versions in the rendering transaction so the stored
+        # versions match the data the page was built from
+        versions = request.env['real.estate.cache.tag'].sudo()._get_versions(tags)
+        if getattr(response, 'is_qweb', False):
+            response.flatten()
+        body = response.get_data()
+        if len(body) > self.MAX_BYTES // 10:
+            return response
+
+        entry = {
+            'body': body,
+            'content_type': response.headers.get('Content-Type', 'text/html; charset=utf-8'),
+            'csrf_token': request.csrf_token().encode(),
+            'versions': {tag: versions.get(tag, 0) for tag in tags},
+            'etag': etag,
+        }
+        key = self._make_key()
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = entry
+            self._size += len(body)
+            while self._entries and (len(self._entries) > self.MAX_ENTRIES or self._size > self.MAX_BYTES):
+                self._drop(next(iter(self._entries)))
+        response.headers['X-Page-Cache'] = 'MISS'
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self._size,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._size -= len(entry['body'])
+
+
+page_cache = PageCache()
@@ -6,6 +6,10 @@ import base64
 from odoo.exceptions import UserError
 import logging
 
+from . import http_cache
+from .page_cache import page_cache
+from ..listing_snapshot import listing_snapshots
+
 _logger = logging.getLogger(__name__)
 
 
@@ -13,31 +17,41 @@ class RealEstateController(http.Controller):
 
     @http.route('/', type='http', auth='public', website=True)
     def property_map(self, **kwargs):
+        cached = page_cache.get()
+        if cached:
+            return cached
 
         # Fetch published properties from database
         Property = request.env['property.property'].sudo()
         # Get the selected city from URL parameters (if any)
         selected_city = kwargs.get('city', '')
-        all_properties = Property.search([('is_published', '=', True)])
-        city_list = sorted(list(set([p.city for p in all_properties if p.city])))
-        # Build the search domain with city filter if selected
-        search_domain = [
-            ('is_published', '=', True),
-            ('latitude', '!=', False),
-            ('longitude', '!=', False)
-        ]
-        # Add city filter if a city is selected
-        if selected_city:
-            search_domain.append(('city', '=', selected_city))
-
-        # Fetch properties based on the search domain
-        properties = Property.search(search_domain)
-
-        # Fetch featured properties for selected city, limit to 5
-        featured_domain = [('is_published', '=', True), ('is_featured', '=', True)]
-        if selected_city:
-            featured_domain.append(('city', '=', selected_city))
-        featured_properties = Property.search(featured_domain)
+        snapshot = listing_snapshots.get(request.env)
+        if snapshot is not None:
+            # Answered from the in-memory columns of the published listings
+            city_list = sorted(snapshot.facet('city'))
+            properties = Property.browse(snapshot.search(city=selected_city, has_coordinates=True))
+            featured_properties = Property.browse(snapshot.search(city=selected_city, featured=True))
+        else:
+            city_list = sorted(
+                city for [city] in Property._read_group([('is_published', '=', True)], ['city']) if city)
+            # Build the search domain with city filter if selected
+            search_domain = [
+                ('is_published', '=', True),
+                ('latitude', '!=', False),
+                ('longitude', '!=', False)
+            ]
+            # Add city filter if a city is selected
+            if selected_city:
+                search_domain.append(('city', '=', selected_city))
+
+            # Fetch properties based on the search domain
+            properties = Property.search(search_domain)
+
+            # Fetch featured properties for selected city
+            featured_domain = [('is_published', '=', True), ('is_featured', '=', True)]
+            if selected_city:
+                featured_domain.append(('city', '=', selected_city))
+            featured_properties = Property.search(featured_domain)
 
         # Get city investment info
         city_investment_info = None
@@ -93,7 +107,7 @@ class RealEstateController(http.Controller):
                     'full_address': full_address,
                 })
 
-        return request.render('real_estate_management.property_map_template', {
+        return page_cache.put(request.render('real_estate_management.property_map_template', {
             'property_count': len(property_data),
             'properties_json': json_scriptsafe.dumps(property_data) if property_data else '[]',
             'category_colors': json_scriptsafe.dumps(category_colors),
@@ -102,7 +116,7 @@ class RealEstateController(http.Controller):
             'featured_properties': featured_properties,
             'city_investment_info': city_investment_info,
 
-        })
+        }))
 
     # @http.route('/city/filter', type='http', auth='public', website=True)
     # def city_filter(self, **kwargs):
@@ -126,29 +140,58 @@ class RealEstateController(http.Controller):
         prop = request.env['property.property'].sudo().browse(property_id)
         if not prop.exists() or not prop.is_published:
             return request.not_found()
+        # Views are counted for cached hits too (the counter is not shown on the page)
+        try:
+            prop._increment_views()
+        except Exception as e:
+            _logger.error("Failed to update views for property %s: %s", prop.id, e)
+
+        # The page shows this property and published ones of the same category
+        etag, last_modified = http_cache.compute_validators(
+            ['|', ('id', '=', prop.id),
+             '&', ('is_published', '=', True), ('category_id', '=', prop.category_id.id)],
+            tags=prop._detail_cache_tags())
+        response = http_cache.not_modified(etag, last_modified) or page_cache.get(etag)
+        if response:
+            return http_cache.add_validators(response, etag, last_modified)
+
         if not prop.ai_content_generated:
             try:
                 prop.generate_ai_content()
             except Exception as e:
-                _logger.error(f"Failed to generate AI content for property {prop.id}: {e}")
-        try:
-            prop.write({'views': prop.views + 1})
-        except Exception as e:
-            _logger.error(f"Failed to update views for property {prop.id}: {e}")
-        return request.render('real_estate_management.property_detail_page', {
+                _logger.error("Failed to generate AI content for property %s: %s", prop.id, e)
+        similar_properties = prop._get_similar_properties()
+        prop._prefetch_detail_page(similar_properties)
+        response = page_cache.put(request.render('real_estate_management.property_detail_page', {
             'property': prop,
-
-        })
+            'similar_properties': similar_properties,
+        }), tags=prop._detail_cache_tags(), etag=etag)
+        return http_cache.add_validators(response, etag, last_modified)
+
+    # Listing sort options -> order clause
+    LISTING_SORT_ORDERS = {
+        'default': 'id',
+        'newest': 'id desc',
+        'price_asc': 'price',
+        'price_desc': 'price desc',
+        'price_per_sqft': 'price_per_sqft',
+    }
 
     @http.route('/properties', type='http', auth='public', website=True)
     def property_listing(self, **kwargs):
         search = kwargs.get('search', '')
         city = kwargs.get('city', '')
         zip_code = kwargs.get('zip_code', '')
+        category = kwargs.get('category', '')
+        sort = kwargs.get('sort', 'default')
+        if sort not in self.LISTING_SORT_ORDERS:
+            sort = 'default'
 
         domain = [('is_published', '=', True),
                   ('status', '!=', 'sold'),  # Hide sold properties
         ]
+        if category.isdigit():
+            domain.append(('category_id', '=', int(category)))
         if search:
             domain += ['|', '|',
                        ('name', 'ilike', search),
@@ -159,30 +202,33 @@ class RealEstateController(http.Controller):
         if zip_code:
             domain.append(('zip_code', 'ilike', zip_code))
 
-        properties = request.env['property.property'].sudo().search(domain)
+        etag, last_modified = http_cache.compute_validators(domain)
+        response = http_cache.not_modified(etag, last_modified) or page_cache.get(etag)
+        if response:
+            return http_cache.add_validators(response, etag, last_modified)
 
-        property_card_data = []
-        for prop in properties:
-            property_card_data.append({
-                'id': prop.id,
-                'name': prop.name,
-                'image_url': f"data:image/png;base64,{prop.image.decode('utf-8')}" if prop.image else '',
-                'category': prop.category_id.name or '',
-                'price': prop.price,
-                'plot_area': prop.plot_area,
-                'price_per_sqft': prop.price_per_sqft,
-                'city': prop.city,
-                'zip_code': prop.zip_code,
-                'status': prop.status,
-                'status_ribbon_html': prop.status_ribbon_html,
-            })
-
-        return request.render('real_estate_management.property_listing_template', {
-            'properties': property_card_data,
+        Property = request.env['property.property'].sudo()
+        order = self.LISTING_SORT_ORDERS[sort]
+        # Text search and wildcards need SQL; the other filters are in the snapshot
+        snapshot = None
+        if not (search or zip_code or '%' in city or '_' in city):
+            snapshot = listing_snapshots.get(request.env)
+        if snapshot is not None:
+            properties = Property.browse(snapshot.search(
+                order=order, exclude_statuses=('sold',), city_ilike=city,
+                category_id=int(category) if category.isdigit() else None))
+        else:
+            properties = Property.search(domain, order=order if order.startswith('id') else f'{order}, id')
+
+        response = page_cache.put(request.render('real_estate_management.property_listing_template', {
+            'properties': properties,
             'search': search,
             'city': city,
             'zip_code': zip_code,
-        })
+            'category': category,
+            'sort': sort,
+        }), etag=etag)
+        return http_cache.add_validators(response, etag, last_modified)
 
     @http.route('/property/register', type='http', auth='public', website=True)
     def show_registration_form(self, **kwargs):
@@ -232,131 +278,138 @@ class RealEstateController(http.Controller):
             _logger.exception("Error in property registration")
             return request.render('real_estate_management.property_submission_error', {'error': str(e)})
 
-    # @http.route('/agents', type='http', auth='user', website=True)
-    # def agent_directory(self, **kwargs):
-    #     """Agent listing page - similar to Redfin agents page"""
-    #
-    #     # Get filters from URL
-    #     search_query = kwargs.get('search', '')
-    #     city_filter = kwargs.get('city', '')
-    #     expertise_filter = kwargs.get('expertise', '')
-    #     sort_by = kwargs.get('sort', 'recommended')  # recommended, sales_volume, deals, rating
-    #
-    #     # ⭐ CHECK IF USER IS LOGGED IN
-    #     if request.env.user._is_public():
-    #         return request.redirect('/web/login?redirect=/agents')
-    #
-    #     # Build domain
-    #     domain = [('is_active', '=', True)]
-    #
-    #     if search_query:
-    #         domain += ['|', '|',
-    #                    ('name', 'ilike', search_query),
-    #                    ('city', 'ilike', search_query),
-    #                    ('zip_code', 'ilike', search_query)]
-    #
-    #     if city_filter:
-    #         domain.append(('city', '=', city_filter))
-    #
-    #     if expertise_filter:
-    #         domain.append(('expertise_level', '=', expertise_filter))
-    #
-    #     # Sorting
-    #     order = 'total_sales_volume desc, total_deals desc'  # Default: recommended
-    #     if sort_by == 'sales_volume':
-    #         order = 'total_sales_volume desc'
-    #     elif sort_by == 'deals':
-    #         order = 'total_deals desc'
-    #     elif sort_by == 'rating':
-    #         order = 'avg_rating desc, review_count desc'
-    #
-    #     # Fetch agents
-    #     Agent = request.env['real.estate.agent'].sudo()
-    #     agents = Agent.search(domain, order=order)
-    #
-    #     # Get unique cities for filter dropdown
-    #     all_agents = Agent.search([('is_active', '=', True)])
-    #     cities = sorted(list(set([a.city for a in all_agents if a.city])))
-    #
-    #     # Count agents
-    #     agent_count = len(agents)
-    #     total_agents = len(all_agents)
-    #
-    #     # Build agent card data
-    #     agent_data = []
-    #     for agent in agents:
-    #         # Format sales volume
-    #         sales_volume_str = f"₹{agent.total_sales_volume / 10000000:.1f}M" if agent.total_sales_volume >= 10000000 else f"₹{agent.total_sales_volume / 100000:.1f}L"
-    #
-    #         # Get profile image URL
-    #         image_url = None
-    #         if agent.image:
-    #             image_url = f"data:image/png;base64,{agent.image.decode('utf-8')}"
-    #
-    #         agent_data.append({
-    #             'id': agent.id,
-    #             'name': agent.name,
-    #             'designation': dict(agent._fields['designation'].selection).get(agent.designation),
-    #             'expertise_level': agent.expertise_level,
-    #             'city': agent.city or '',
-    #             'state': agent.state_id.name or '',
-    #             'email': agent.email,
-    #             'phone': agent.phone,
-    #             'image_url': image_url,
-    #             'total_sales_volume': agent.total_sales_volume,
-    #             'sales_volume_display': sales_volume_str,
-    #             'total_deals': agent.total_deals,
-    #             'avg_rating': agent.avg_rating,
-    #             'short_bio': agent.short_bio or '',
-    #             'active_listings': agent.active_property_count,
-    #         })
-    #
-    #     return request.render('real_estate_management.agent_directory_template', {
-    #         'agents': agent_data,
-    #         'agent_count': agent_count,
-    #         'total_agents': total_agents,
-    #         'cities': cities,
-    #         'search_query': search_query,
-    #         'city_filter': city_filter,
-    #         'expertise_filter': expertise_filter,
-    #         'sort_by': sort_by,
-    #     })
-
-    # @http.route('/agent/<int:agent_id>', type='http', auth='public', website=True)
-    # def agent_detail(self, agent_id, **kwargs):
-    #     """Individual agent profile page"""
-    #     agent = request.env['real.estate.agent'].sudo().browse(agent_id)
-    #
-    #     if not agent.exists() or not agent.is_active:
-    #         return request.not_found()
-    #
-    #     # Get agent's published properties
-    #     properties = request.env['property.property'].sudo().search([
-    #         ('agent_id', '=', agent_id),
-    #         ('is_published', '=', True)
-    #     ], limit=12, order='create_date desc')
-    #
-    #     # Format property data
-    #     property_data = []
-    #     for prop in properties:
-    #         image_url = None
-    #         if prop.image:
-    #             image_url = f"data:image/png;base64,{prop.image.decode('utf-8')}"
-    #
-    #         property_data.append({
-    #             'id': prop.id,
-    #             'name': prop.name,
-    #             'image_url': image_url,
-    #             'price': prop.price,
-    #             'plot_area': prop.plot_area,
-    #             'city': prop.city,
-    #             'category': prop.category_id.name if prop.category_id else 'Property',
-    #         })
-    #
-    #     return request.render('real_estate_management.agent_detail_template', {
-    #         'agent': agent,
-    #         'properties': property_data,
-    #     })
+    # Directory sort options -> order clause, each backed by an index on real_estate_agent
+    AGENT_SORT_ORDERS = {
+        'recommended': 'global_rank, id',
+        'sales_volume': 'total_sales_volume desc, total_deals desc, id',
+        'deals': 'total_deals desc, id',
+        'rating': 'avg_rating desc, review_count desc, id',
+    }
+    AGENTS_PER_PAGE = 24
+
+    @http.route(['/agents', '/agents/page/<int:page>'], type='http', auth='user', website=True)
+    def agent_directory(self, page=1, **kwargs):
+        """Agent listing page - similar to Redfin agents page"""
+
+        # Get filters from URL
+        search_query = kwargs.get('search', '')
+        city_filter = kwargs.get('city', '')
+        expertise_filter = kwargs.get('expertise', '')
+        sort_by = kwargs.get('sort', 'recommended')  # recommended, sales_volume, deals, rating
+        if sort_by not in self.AGENT_SORT_ORDERS:
+            sort_by = 'recommended'
+
+        # ⭐ CHECK IF USER IS LOGGED IN
+        if request.env.user._is_public():
+            return request.redirect('/web/login?redirect=/agents')
+
+        # Build domain
+        domain = [('is_active', '=', True)]
+
+        if search_query:
+            domain += ['|', '|',
+                       ('name', 'ilike', search_query),
+                       ('city', 'ilike', search_query),
+                       ('zip_code', 'ilike', search_query)]
+
+        if city_filter:
+            domain.append(('city', '=', city_filter))
+
+        if expertise_filter:
+            domain.append(('expertise_level', '=', expertise_filter))
+
+        # Sorting: within a city the precomputed city rank is the recommendation
+        order = self.AGENT_SORT_ORDERS[sort_by]
+        if sort_by == 'recommended' and city_filter:
+            order = 'city_rank, id'
+
+        Agent = request.env['real.estate.agent'].sudo()
+        agent_count = Agent.search_count(domain)
+        pager = request.website.pager(
+            url='/agents',
+            total=agent_count,
+            page=page,
+            step=self.AGENTS_PER_PAGE,
+            url_args={k: v for k, v in kwargs.items()
+                      if k in ('search', 'city', 'expertise', 'sort') and v},
+        )
+        agents = Agent.search(domain, order=order, limit=self.AGENTS_PER_PAGE, offset=pager['offset'])
+
+        # Cached city list and count for the filter dropdown
+        cities = Agent._get_directory_cities()
+        total_agents = Agent.search_count([('is_active', '=', True)])
+
+        designations = dict(Agent._fields['designation'].selection)
+
+        # Build agent card data
+        agent_data = []
+        for agent in agents:
+            # Format sales volume
+            sales_volume_str = f"₹{agent.total_sales_volume / 10000000:.1f}M" if agent.total_sales_volume >= 10000000 else f"₹{agent.total_sales_volume / 100000:.1f}L"
+
+            agent_data.append({
+                'id': agent.id,
+                'name': agent.name,
+                'designation': designations.get(agent.designation),
+                'expertise_level': agent.expertise_level,
+                'city': agent.city or '',
+                'state': agent.state_id.name or '',
+                'email': agent.email,
+                'phone': agent.phone,
+                'image_url': f'/web/image/real.estate.agent/{agent.id}/image' if agent.image else None,
+                'total_sales_volume': agent.total_sales_volume,
+                'sales_volume_display': sales_volume_str,
+                'total_deals': agent.total_deals,
+                'avg_rating': agent.avg_rating,
+                'short_bio': agent.short_bio or '',
+                'active_listings': agent.active_property_count,
+                'global_rank': agent.global_rank,
+                'city_rank': agent.city_rank,
+            })
+
+        return request.render('real_estate_management.agent_directory_template', {
+            'agents': agent_data,
+            'agent_count': agent_count,
+            'total_agents': total_agents,
+            'cities': cities,
+            'search_query': search_query,
+            'city_filter': city_filter,
+            'expertise_filter': expertise_filter,
+            'sort_by': sort_by,
+            'pager': pager,
+        })
+
+    @http.route('/agent/<int:agent_id>', type='http', auth='public', website=True)
+    def agent_detail(self, agent_id, **kwargs):
+        """Individual agent profile page"""
+        agent = request.env['real.estate.agent'].sudo().browse(agent_id)
+
+        if not agent.exists() or not agent.is_active:
+            return request.not_found()
+
+        # Get agent's published properties
+        properties = request.env['property.property'].sudo().search([
+            ('agent_id', '=', agent_id),
+            ('is_published', '=', True)
+        ], limit=12, order='create_date desc')
+
+        # Format property data
+        property_data = []
+        for prop in properties:
+            property_data.append({
+                'id': prop.id,
+                'name': prop.name,
+                'image_url': f'/web/image/property.property/{prop.id}/image' if prop.image else None,
+                'price': prop.price,
+                'plot_area': prop.plot_area,
+                'city': prop.city,
+                'category': prop.category_id.name if prop.category_id else 'Property',
+            })
+
+        return request.render('real_estate_management.agent_detail_template', {
+            'agent': agent,
+            'properties': property_data,
+        })
 
     # @http.route('/agent/<int:agent_id>', type='http', auth='user', website=True)
     # def agent_detail(self, agent_id, **kwargs):
@@ -414,13 +467,9 @@ class RealEstateController(http.Controller):
     def agent_registration_form(self, **kwargs):
         """Public agent registration form"""
 
-        # Get property categories for specializations
-        categories = request.env['property.category'].sudo().search([])
-
-        # Get states
-        states = request.env['res.country.state'].sudo().search([
-            ('country_id', '=', request.env.company.country_id.id)
-        ], order='name')
+        # Dropdown data is cached as (id, name) pairs
+        categories = request.env['property.category']._get_form_options()
+        states = request.env['res.country.state']._get_form_options(request.env.company.country_id.id)
 
         return request.render('real_estate_management.agent_registration_form_template', {
             'categories': categories,
@@ -500,7 +549,7 @@ class RealEstateController(http.Controller):
                     })
                     registration.attachment_ids = [(4, attachment.id)]
 
-            _logger.info(f"Agent registration submitted: {registration.name} - {registration.agent_name}")
+            _logger.info("Agent registration %s submitted", registration.name)
 
             return request.render('real_estate_management.agent_registration_success_template', {
                 'registration': registration,
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""Chunked XML sitemap of the property and category listing pages.
+
+Published properties are split into fixed id ranges, one sitemap file per
+range, listed by a sitemap index. A file's content only depends on the rows
+of its range, so each rendered file is kept per worker under the count and
+latest ``write_date`` of that range: editing one listing only regenerates
+the file that contains it.
+"""
+import hashlib
+import threading
+
+from markupsafe import escape
+
+from odoo import http
+from odoo.http import request
+from odoo.tools.lru import LRU
+
+from . import http_cache
+from .page_cache import page_cache, PROPERTY_PAGE_TAGS
+
+SITEMAP_CHUNK_SIZE = 10000  # property ids per sitemap file (the protocol allows 50000 URLs)
+
+_summary_cache = {}  # {dbname: (tag versions, summary)}
+_file_cache = LRU(512)
+_lock = threading.Lock()
+
+
+def _lastmod(value):
+    return value.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+
+
+class PropertySitemapController(http.Controller):
+
+    # -------------------- data --------------------
+    @staticmethod
+    def _get_summary():
+        """Return ({chunk: (count, last write_date)}, {category id: last write_date}).
+
+        Recomputed with two aggregate queries only when a property or
+        category tag version moved (see ``real.estate.cache.tag``).
+        """
+        versions = page_cache.get_versions()
+        key = tuple(versions.get(tag, 0) for tag in PROPERTY_PAGE_TAGS)
+        cached = _summary_cache.get(request.db)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        cr = request.env.cr
+        cr.execute("""
+            SELECT id / %s AS chunk, count(*), max(write_date)
+              FROM property_property
+             WHERE is_published AND active
+             GROUP BY chunk
+             ORDER BY chunk
+        """, [SITEMAP_CHUNK_SIZE])
+        chunks = {chunk: (count, last) for chunk, count, last in cr.fetchall()}
+        cr.execute("""
+            SELECT c.id, greatest(c.write_date, max(p.write_date))
+              FROM property_category c
+              JOIN property_property p ON p.category_id = c.id AND p.is_published AND p.active
+             GROUP BY c.id
+             ORDER BY c.id
+        """)
+        categories = dict(cr.fetchall())
+        with _lock:
+            _summary_cache[request.db] = (key, (chunks, categories))
+        return chunks, categories
+
+    @staticmethod
+    def _render_urlset(entries):
+        """entries: iterable of (path, lastmod) relative to the website"""
+        base_url = request.website.get_base_url()
+        parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+        parts.extend(
+            f'<url><loc>{escape(base_url + path)}</loc><lastmod>{_lastmod(lastmod)}</lastmod></url>\n'
+            for path, lastmod in entries
+        )
+        parts.append('</urlset>\n')
+        return ''.join(parts).encode()
+
+    @staticmethod
+    def _serve(cache_key, last_modified, render):
+        """Serve a sitemap file from the per-worker cache, rendering it on a miss"""
+        cache_key = (request.db, request.website.id, *cache_key)
+        etag = f'W/"{hashlib.sha1(repr(cache_key).encode()).hexdigest()}"'
+        last_modified = http_cache.last_change(PROPERTY_PAGE_TAGS, last_modified)
+        response = http_cache.not_modified(etag, last_modified)
+        if response:
+            return response
+        body = _file_cache.get(cache_key)
+        if body is None:
+            body = _file_cache[cache_key] = render()
+        response = request.make_response(body, headers=[('Content-Type', 'application/xml; charset=utf-8')])
+        return http_cache.add_validators(response, etag, last_modified)
+
+    # -------------------- routes --------------------
+    @http.route('/sitemap-properties.xml', type='http', auth='public', website=True,
+                multilang=False, sitemap=False)
+    def sitemap_index(self, **kwargs):
+        chunks, categories = self._get_summary()
+        last_modified = max([last for _count, last in chunks.values()] + list(categories.values()), default=None)
+
+        def render():
+            base_url = request.website.get_base_url()
+            files = [(f'/sitemap-properties-{chunk}.xml', last) for chunk, (_count, last) in chunks.items()]
+            if categories:
+                files.insert(0, ('/sitemap-properties-categories.xml', max(categories.values())))
+            parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+                     '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+            parts.extend(
+                f'<sitemap><loc>{escape(base_url + path)}</loc><lastmod>{_lastmod(last)}</lastmod></sitemap>\n'
+                for path, last in files
+            )
+            parts.append('</sitemapindex>\n')
+            return ''.join(parts).encode()
+
+        return self._serve(('index', tuple(chunks.items()), tuple(categories.items())), last_modified, render)
+
+    @http.route('/sitemap-properties-categories.xml', type='http', auth='public', website=True,
+                multilang=False, sitemap=False)
+    def sitemap_categories(self, **kwargs):
+        _chunks, categories = self._get_summary()
+        if not categories:
+            return request.not_found()
+        return self._serve(
+            ('categories', tuple(categories.items())),
+            max(categories.values()),
+            lambda: self._render_urlset(
+                (f'/properties?category={category_id}', last) for category_id, last in categories.items()),
+        )
+
+    @http.route('/sitemap-properties-<int:chunk>.xml', type='http', auth='public', website=True,
+                multilang=False, sitemap=False)
+    def sitemap_chunk(self, chunk, **kwargs):
+        chunks, _categories = self._get_summary()
+        if chunk not in chunks:
+            return request.not_found()
+        count, last_modified = chunks[chunk]
+
+        def render():
+            request.env.cr.execute("""
+                SELECT id, write_date
+                  FROM property_property
+                 WHERE is_published AND active AND id >= %s AND id < %s
+                 ORDER BY id
+            """, [chunk * SITEMAP_CHUNK_SIZE, (chunk + 1) * SITEMAP_CHUNK_SIZE])
+            return self._render_urlset((f'/property/{pid}', last) for pid, last in request.env.cr.fetchall())
+
+        return self._serve(('chunk', chunk, count, last_modified), last_modified, render)
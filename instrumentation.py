@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""In-process metrics for the module, exposed in Prometheus text format.
+
+Metrics live in the worker process that records them; every series carries
+a ``worker`` label (the pid) so that scrapes landing on different workers
+produce distinct series instead of counters that go back and forth.
+
+SQL counts are read from the process-wide statement counter, which is exact
+in multi-process (prefork) mode where a worker serves one request at a time.
+"""
+import functools
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from odoo import sql_db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+HELP = {
+    'real_estate_duration_seconds': 'Duration of routes, model methods and external calls',
+    'real_estate_sql_queries': 'SQL statements issued by routes and model methods',
+    'real_estate_errors_total': 'Failed routes, model methods and external calls',
+    'real_estate_ai_cache_total': 'AI response cache lookups by result',
+}
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # {(metric, labels): [bucket counts..., sum, count]}
+        self._histograms = {}
+        self._buckets = {}
+        self._counters = defaultdict(float)
+        self._gauges = {}  # {metric: (help, callback returning {labels: value})}
+
+    def observe(self, metric, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * (len(buckets) + 2)
+                self._buckets[metric] = buckets
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def inc(self, metric, value=1, **labels):
+        with self._lock:
+            self._counters[(metric, tuple(sorted(labels.items())))] += value
+
+    def register_gauge(self, metric, help_text, callback):
+        """callback(env) returns {labels tuple: value}, called at scrape time"""
+        self._gauges[metric] = (help_text, callback)
+
+    # -------------------- exposition --------------------
+    @staticmethod
+    def _labels(labels, **extra):
+        items = [*labels, *extra.items(), ('worker', os.getpid())]
+        return '{%s}' % ','.join(
+            '%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"')) for name, value in items)
+
+    def render(self, env):
+        lines = []
+        with self._lock:
+            histograms = {key: list(series) for key, series in self._histograms.items()}
+            counters = dict(self._counters)
+        for metric in sorted({metric for metric, _labels in histograms}):
+            lines += [f'# HELP {metric} {HELP.get(metric, metric)}', f'# TYPE {metric} histogram']
+            buckets = self._buckets[metric]
+            for (name, labels), series in sorted(histograms.items()):
+                if name != metric:
+                    continue
+                for bound, count in zip(buckets, series):
+                    lines.append(f'{metric}_bucket{self._labels(labels, le=bound)} {count}')
+                lines.append(f'{metric}_bucket{self._labels(labels, le="+Inf")} {series[-1]}')
+                lines.append(f'{metric}_sum{self._labels(labels)} {series[-2]}')
+                lines.append(f'{metric}_count{self._labels(labels)} {series[-1]}')
+        for metric in sorted({metric for metric, _labels in counters}):
+            lines += [f'# HELP {metric} {HELP.get(metric, metric)}', f'# TYPE {metric} counter']
+            lines += [f'{metric}{self._labels(labels)} {value}'
+                      for (name, labels), value in sorted(counters.items()) if name == metric]
+        for metric, (help_text, callback) in sorted(self._gauges.items()):
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} gauge']
+            lines += [f'{metric}{self._labels(labels)} {value}' for labels, value in callback(env).items()]
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class Measure:
+    """Handle yielded by ``timed``: set ``failed`` for errors that do not raise"""
+    __slots__ = ('failed',)
+
+    def __init__(self):
+        self.failed = False
+
+
+@contextmanager
+def timed(kind, name, count_queries=True):
+    """Record the duration, SQL statements and failure of a block.
+
+    :param kind: ``route``, ``method`` or ``external``
+    :param name: what is measured, e.g. ``property.property.generate_ai_content``
+    """
+    measure = Measure()
+    queries = sql_db.sql_counter
+    start = time.perf_counter()
+    try:
+        yield measure
+    except Exception:
+        measure.failed = True
+        raise
+    finally:
+        registry.observe('real_estate_duration_seconds', time.perf_counter() - start, kind=kind, name=name)
+        if count_queries:
+            registry.observe('real_estate_sql_queries', sql_db.sql_counter - queries,
+                             buckets=QUERY_BUCKETS, kind=kind, name=name)
+        if measure.failed:
+            registry.inc('real_estate_errors_total', kind=kind, name=name)
+
+
+def instrument(func):
+    """Decorator timing a model method under ``<model>.<method>``"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with timed('method', f'{self._name}.{func.__name__}'):
+            return func(self, *args, **kwargs)
+    return wrapper
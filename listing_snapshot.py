@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""Per-worker columnar snapshot of the published listings.
+
+The public pages filter and sort the published catalogue on a handful of
+columns. Each worker keeps those columns of every published, active
+``property.property`` row in compact NumPy arrays and answers these
+filters in-process; pages then browse the resulting ids as usual.
+
+The snapshot is refreshed lazily: at most every ``CHECK_INTERVAL`` seconds
+it compares the ``property.property`` cache tag (bumped by every change, see
+``real.estate.cache.tag``) and, when it moved, applies the rows written since
+the last refresh. Deleted rows leave no trace to read, so a row count
+mismatch (or ``FULL_RELOAD_INTERVAL``) triggers a full reload.
+
+NumPy is optional: without it, or whenever the snapshot cannot be built,
+``get`` returns None and callers run their usual ORM query.
+"""
+import threading
+import time
+from datetime import timedelta
+
+import logging
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_logger = logging.getLogger(__name__)
+
+FEATURED = 1
+HAS_COORDINATES = 2
+
+_COLUMNS = """id, price, plot_area, price_per_sqft, latitude, longitude, category_id,
+              city, status, is_featured, write_date"""
+
+
+class Snapshot:
+    """Immutable set of columns; refreshes build a new snapshot"""
+
+    def __init__(self, ids, price, plot_area, price_per_sqft, lat, lon, category, city, status, flags,
+                 cities, statuses, max_write_date, tag_version):
+        self.ids = ids
+        self.price = price
+        self.plot_area = plot_area
+        self.price_per_sqft = price_per_sqft
+        self.lat = lat
+        self.lon = lon
+        self.category = category
+        self.city = city
+        self.status = status
+        self.flags = flags
+        self.cities = cities  # city code -> name
+        self.statuses = statuses  # status code -> selection value
+        self.max_write_date = max_write_date
+        self.tag_version = tag_version
+        self.loaded_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, column).nbytes for column in (
+            'ids', 'price', 'plot_area', 'price_per_sqft', 'lat', 'lon', 'category', 'city', 'status', 'flags'))
+
+    # -------------------- queries --------------------
+    def mask(self, city=None, city_ilike=None, category_id=None, featured=None, exclude_statuses=(),
+             has_coordinates=False):
+        """Boolean mask of the rows matching the filters, with the ORM semantics
+        of ``=`` for ``city`` and ``ilike`` for ``city_ilike``"""
+        mask = np.ones(len(self.ids), dtype=bool)
+        if city:
+            mask &= np.isin(self.city, [code for code, name in enumerate(self.cities) if name == city])
+        if city_ilike:
+            needle = city_ilike.casefold()
+            mask &= np.isin(self.city, [code for code, name in enumerate(self.cities)
+                                        if name and needle in name.casefold()])
+        if category_id:
+            mask &= self.category == category_id
+        if featured is not None:
+            mask &= ((self.flags & FEATURED) != 0) == featured
+        if exclude_statuses:
+            mask &= ~np.isin(self.status, [self.statuses.index(s) for s in exclude_statuses if s in self.statuses])
+        if has_coordinates:
+            mask &= (self.flags & HAS_COORDINATES) != 0
+        return mask
+
+    def search(self, order='id', limit=None, **filters):
+        """Ids matching ``filters``, sorted on ``order`` (a column, optionally
+        followed by ``desc``; ties are broken on id)"""
+        mask = self.mask(**filters)
+        ids = self.ids[mask]
+        column, _sep, direction = order.partition(' ')
+        if column != 'id':
+            values = getattr(self, column)[mask]
+            keys = (ids, -values if direction == 'desc' else values)
+            ids = ids[np.lexsort(keys)]
+        elif direction == 'desc':
+            ids = ids[::-1]
+        if limit:
+            ids = ids[:limit]
+        return ids.tolist()
+
+    def grid(self, cell_size, **filters):
+        """Bin the listings with coordinates and a price per sq.ft into square
+        cells of ``cell_size`` degrees.
+
+        :return: list of (row, column, count, median, mean) per non-empty
+            cell; a cell covers latitudes [row, row + 1) * cell_size and
+            longitudes [column, column + 1) * cell_size
+        """
+        mask = self.mask(has_coordinates=True, **filters) & (self.price_per_sqft > 0)
+        values = self.price_per_sqft[mask].astype(np.float64)
+        if not len(values):
+            return []
+        keys = np.stack([np.floor(self.lat[mask] / cell_size), np.floor(self.lon[mask] / cell_size)], axis=1)
+        cells, inverse, counts = np.unique(keys.astype(np.int64), axis=0, return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+        means = np.bincount(inverse, weights=values) / counts
+        # Medians: sort values by cell then value, pick the middle of each cell's run
+        ordered = values[np.lexsort((values, inverse))]
+        starts = np.cumsum(counts) - counts
+        medians = (ordered[starts + (counts - 1) // 2] + ordered[starts + counts // 2]) / 2
+        return list(zip(cells[:, 0].tolist(), cells[:, 1].tolist(), counts.tolist(),
+                        medians.tolist(), means.tolist()))
+
+    def facet(self, column, **filters):
+        """{value: count} of a dictionary-encoded column over the matching rows"""
+        codes, counts = np.unique(getattr(self, column)[self.mask(**filters)], return_counts=True)
+        labels = self.cities if column == 'city' else self.statuses
+        return {labels[code]: int(count) for code, count in zip(codes, counts) if code >= 0 and labels[code]}
+
+
+class ListingSnapshots:
+
+    CHECK_INTERVAL = 2.0  # seconds between cache tag checks per worker
+    FULL_RELOAD_INTERVAL = 600
+    # Rows committed late with an older write_date are caught by re-reading this window
+    WRITE_DATE_OVERLAP = timedelta(seconds=60)
+
+    def __init__(self):
+        self._snapshots = {}  # {dbname: Snapshot}
+        self._checked_at = {}  # {dbname: monotonic time}
+        self._lock = threading.Lock()
+
+    def get(self, env):
+        """Return an up to date snapshot of the database of ``env``, or None"""
+        if np is None:
+            return None
+        dbname = env.cr.dbname
+        snapshot = self._snapshots.get(dbname)
+        now = time.monotonic()
+        if snapshot is not None and now - self._checked_at.get(dbname, 0.0) <= self.CHECK_INTERVAL:
+            return snapshot
+        # One refresh at a time; other threads keep using the current snapshot
+        if not self._lock.acquire(blocking=snapshot is None):
+            return snapshot
+        try:
+            snapshot = self._snapshots.get(dbname)
+            # A failed query must not abort the request transaction used by the SQL fallback
+            with env.cr.savepoint(flush=False):
+                version = env['real.estate.cache.tag'].sudo()._get_versions(['property.property']).get(
+                    'property.property', 0)
+                if snapshot is None or now - snapshot.loaded_at > self.FULL_RELOAD_INTERVAL:
+                    snapshot = self._load(env, version)
+                elif version != snapshot.tag_version:
+                    snapshot = self._refresh(env, snapshot, version)
+            self._snapshots[dbname] = snapshot
+            self._checked_at[dbname] = now
+            return snapshot
+        except Exception:
+            _logger.exception("Listing snapshot refresh failed, falling back to SQL")
+            self._snapshots.pop(dbname, None)
+            return None
+        finally:
+            self._lock.release()
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+            self._checked_at.clear()
+
+    def stats(self):
+        snapshots = list(self._snapshots.values())
+        return {
+            'rows': sum(len(snapshot) for snapshot in snapshots),
+            'bytes': sum(snapshot.nbytes for snapshot in snapshots),
+        }
+
+    # -------------------- loading --------------------
+    def _load(self, env, version):
+        start = time.perf_counter()
+        env.cr.execute(f"SELECT {_COLUMNS} FROM property_property WHERE is_published AND active ORDER BY id")
+        snapshot = self._build(env, env.cr.fetchall(), version)
+        _logger.info("Listing snapshot loaded: %s rows, %s bytes in %.0fms",
+                     len(snapshot), snapshot.nbytes, (time.perf_counter() - start) * 1000)
+        return snapshot
+
+    def _refresh(self, env, snapshot, version):
+        since = snapshot.max_write_date - self.WRITE_DATE_OVERLAP if snapshot.max_write_date else None
+        if since is None:
+            return self._load(env, version)
+        env.cr.execute(f"""
+            SELECT {_COLUMNS}, is_published AND active
+              FROM property_property
+             WHERE write_date >= %s
+        """, [since])
+        changes = env.cr.fetchall()
+        env.cr.execute("SELECT count(*) FROM property_property WHERE is_published AND active")
+        [expected] = env.cr.fetchone()
+
+        changed_ids = np.array([row[0] for row in changes], dtype=np.int64)
+        keep = ~np.isin(snapshot.ids, changed_ids)
+        kept_rows = len(snapshot) - int((~keep).sum())
+        published = [row[:-1] for row in changes if row[-1]]
+        if kept_rows + len(published) != expected:
+            # Rows were deleted (or missed): start over
+            return self._load(env, version)
+        fresh = self._build(env, published, version, base=snapshot)
+        columns = {
+            column: np.concatenate([getattr(snapshot, column)[keep], getattr(fresh, column)])
+            for column in ('ids', 'price', 'plot_area', 'price_per_sqft', 'lat', 'lon', 'category', 'city',
+                           'status', 'flags')
+        }
+        order = np.argsort(columns['ids'], kind='stable')
+        max_write_date = max(filter(None, [snapshot.max_write_date, fresh.max_write_date]))
+        _logger.debug("Listing snapshot refreshed: %s changed rows, %s rows", len(changes), expected)
+        refreshed = Snapshot(**{column: values[order] for column, values in columns.items()},
+                             cities=fresh.cities, statuses=fresh.statuses,
+                             max_write_date=max_write_date, tag_version=version)
+        refreshed.loaded_at = snapshot.loaded_at
+        return refreshed
+
+    def _build(self, env, rows, version, base=None):
+        statuses = [value for value, _label in env['property.property']._fields['status'].selection]
+        cities = list(base.cities) if base else []
+        city_codes = {name: code for code, name in enumerate(cities)}
+        city_column, status_column, flags = [], [], []
+        for row in rows:
+            city = row[7]
+            if city not in city_codes:
+                city_codes[city] = len(cities)
+                cities.append(city)
+            city_column.append(city_codes[city])
+            status_column.append(statuses.index(row[8]) if row[8] in statuses else -1)
+            flags.append((FEATURED if row[9] else 0) | (HAS_COORDINATES if row[4] and row[5] else 0))
+        return Snapshot(
+            ids=np.array([row[0] for row in rows], dtype=np.int64),
+            price=np.array([row[1] or 0.0 for row in rows], dtype=np.float64),
+            plot_area=np.array([row[2] or 0.0 for row in rows], dtype=np.float32),
+            price_per_sqft=np.array([row[3] or 0.0 for row in rows], dtype=np.float32),
+            lat=np.array([row[4] or 0.0 for row in rows], dtype=np.float64),
+            lon=np.array([row[5] or 0.0 for row in rows], dtype=np.float64),
+            category=np.array([row[6] or 0 for row in rows], dtype=np.int32),
+            city=np.array(city_column, dtype=np.int32),
+            status=np.array(status_column, dtype=np.int8),
+            flags=np.array(flags, dtype=np.uint8),
+            cities=cities,
+            statuses=statuses,
+            max_write_date=max((row[10] for row in rows if row[10]), default=base.max_write_date if base else None),
+            tag_version=version,
+        )
+
+
+listing_snapshots = ListingSnapshots()
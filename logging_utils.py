@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Logging helpers for the module's hot paths.
+
+- ``redact`` turns a payload into something safe and cheap to log: binaries
+  are replaced by their size and personal data is masked.
+- ``SampledLogger`` logs one in N records of a high-volume event.
+
+Log calls on hot paths pass their arguments lazily (``%s``), so nothing is
+formatted when the level is disabled; payload dumps are DEBUG only.
+"""
+import itertools
+import logging
+import re
+import threading
+
+# Field names whose values are personal data or secrets
+SENSITIVE_KEYS = frozenset({
+    'email', 'contact_email', 'phone', 'contact_phone', 'phone_number', 'whatsapp',
+    'adhar_image', 'aadhar_number', 'pan_number', 'license_number', 'password', 'api_key',
+    'Authorization',
+})
+MAX_TEXT_LENGTH = 200
+_BASE64 = re.compile(r'[A-Za-z0-9+/=\s]+')
+
+
+def redact(value):
+    """Return a copy of ``value`` that is safe to log"""
+    if isinstance(value, dict):
+        return {
+            key: ('***' if value[key] else value[key]) if key in SENSITIVE_KEYS else redact(value[key])
+            for key in value
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    if isinstance(value, (bytes, bytearray)):
+        return f'<{len(value)} bytes>'
+    if isinstance(value, str) and len(value) > MAX_TEXT_LENGTH:
+        if _BASE64.fullmatch(value[:MAX_TEXT_LENGTH]):
+            return f'<base64, {len(value)} chars>'
+        return f'{value[:MAX_TEXT_LENGTH]}... <{len(value)} chars>'
+    return value
+
+
+class SampledLogger:
+    """Wrap a logger to emit only one in ``rate`` records per message.
+
+    Records are counted per message template, the first one is always
+    emitted and sampled records say how many they stand for.
+    """
+
+    def __init__(self, logger, rate=100):
+        self.logger = logger
+        self.rate = rate
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _log(self, level, msg, *args):
+        if not self.logger.isEnabledFor(level):
+            return
+        counter = self._counters.get(msg)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(msg, itertools.count())
+        if next(counter) % self.rate == 0:
+            self.logger.log(level, msg + ' [sampled 1/%s]', *args, self.rate)
+
+    def debug(self, msg, *args):
+        self._log(logging.DEBUG, msg, *args)
+
+    def info(self, msg, *args):
+        self._log(logging.INFO, msg, *args)
+
+    def warning(self, msg, *args):
+        self._log(logging.WARNING, msg, *args)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Move the AI content from the former Html columns to the ai_content and
+city_investment_data Json fields."""
+import re
+
+from odoo.tools import html2plaintext, sql
+from psycopg2.extras import Json
+
+_ITEM = re.compile(r'<li[^>]*>(.*?)</li>|<p[^>]*>(.*?)</p>', re.S)
+
+AI_COLUMNS = {
+    'ai_key_highlights': 'key_highlights',
+    'ai_investment_data': 'investment_data',
+    'ai_nearby_places': 'nearby_places',
+    'ai_unique_features': 'unique_features',
+    'ai_lifestyle_benefits': 'lifestyle_benefits',
+}
+CITY_COLUMNS = {
+    'city_investment_reasons': 'investment_reasons',
+    'city_growth_potential': 'growth_potential',
+    'city_infrastructure': 'infrastructure',
+    'city_market_trends': 'market_trends',
+}
+
+
+def _points(html):
+    points = [html2plaintext(li or p).strip() for li, p in _ITEM.findall(html or '')]
+    return [point for point in points if point and point not in ('Information not available', 'Information not available.')]
+
+
+def _migrate(cr, columns, target, flag):
+    columns = {column: section for column, section in columns.items()
+               if sql.column_exists(cr, 'property_property', column)}
+    if not columns:
+        return
+    cr.execute("SELECT id, %s FROM property_property WHERE %s AND %s IS NULL" % (
+        ', '.join(columns), flag, target))
+    for row in cr.fetchall():
+        data = {section: _points(html) for section, html in zip(columns.values(), row[1:])}
+        data = {section: points for section, points in data.items() if points}
+        if data:
+            cr.execute("UPDATE property_property SET %s = %%s WHERE id = %%s" % target, [Json(data), row[0]])
+        else:
+            # Nothing usable: let the content be generated again
+            cr.execute("UPDATE property_property SET %s = false WHERE id = %%s" % flag, [row[0]])
+    for column in columns:
+        cr.execute("ALTER TABLE property_property DROP COLUMN %s" % column)
+
+
+def migrate(cr, version):
+    _migrate(cr, AI_COLUMNS, 'ai_content', 'ai_content_generated')
+    _migrate(cr, CITY_COLUMNS, 'city_investment_data', 'city_investment_generated')
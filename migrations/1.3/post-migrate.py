@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""Initialise real.estate.agent.rating_sum, the unrounded total behind avg_rating."""
+
+
+def migrate(cr, version):
+    # Best estimate for reviews recorded before the ledger
+    cr.execute("""
+        UPDATE real_estate_agent
+           SET rating_sum = avg_rating * review_count
+         WHERE review_count > 0
+    """)
+    # Exact where the ledger holds every review of the agent
+    cr.execute("""
+        UPDATE real_estate_agent a
+           SET rating_sum = l.total
+          FROM (SELECT agent_id, count(*) AS reviews, sum(rating) AS total
+                  FROM real_estate_agent_ledger
+                 WHERE entry_type = 'review'
+                 GROUP BY agent_id) l
+         WHERE l.agent_id = a.id AND l.reviews = a.review_count
+    """)
@@ -3,4 +3,12 @@ from . import property_category
 from . import property_registration
 from . import agent
 from . import agent_registration
-from . import property_gallery
\ No newline at end of file
+from . import property_gallery
+from . import agent_ledger
+from . import agent_matching
+from . import cache_tag
+from . import res_country_state
+from . import property_feed
+from . import benchmark
+from . import ir_http
+from . import ai_cache
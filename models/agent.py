@@ -1,4 +1,7 @@
-from odoo import models, fields, api, _
+from collections import defaultdict
+from datetime import timedelta
+
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import ValidationError, UserError
 import logging
 
@@ -47,21 +50,35 @@ class RealEstateAgent(models.Model):
         string='Property Specializations'
     )
 
-    # Performance Metrics
+    # Performance Metrics (maintained incrementally from the ledger)
     total_sales_volume = fields.Monetary(
         string='Total Sales Volume',
         currency_field='currency_id',
+        readonly=True,
         help='Total value of properties sold'
     )
-    total_deals = fields.Integer(string='Total Deals Closed', default=0)
-    avg_rating = fields.Float(string='Average Rating', digits=(2, 1), default=5.0)
-    review_count = fields.Integer(string='Number of Reviews', default=0)
+    total_deals = fields.Integer(string='Total Deals Closed', default=0, readonly=True)
+    avg_rating = fields.Float(string='Average Rating', digits=(2, 1), default=5.0, readonly=True)
+    review_count = fields.Integer(string='Number of Reviews', default=0, readonly=True)
+    # Unrounded total of the ratings: avg_rating is derived from it, never the reverse
+    rating_sum = fields.Float(string='Rating Total', default=0.0, readonly=True)
+    ledger_ids = fields.One2many('real.estate.agent.ledger', 'agent_id', string='Deals & Reviews')
+
+    # Windowed metrics (refreshed by cron, never computed on read)
+    sales_volume_90d = fields.Monetary(string='Sales Volume (90 days)', currency_field='currency_id', readonly=True)
+    deals_90d = fields.Integer(string='Deals (90 days)', readonly=True)
+    sales_volume_365d = fields.Monetary(string='Sales Volume (1 year)', currency_field='currency_id', readonly=True)
+    deals_365d = fields.Integer(string='Deals (1 year)', readonly=True)
     currency_id = fields.Many2one(
         'res.currency',
         string='Currency',
         default=lambda self: self.env.company.currency_id.id
     )
 
+    # Leaderboard (materialized ranks, see _refresh_leaderboard)
+    global_rank = fields.Integer(string='Global Rank', readonly=True, index='btree_not_null')
+    city_rank = fields.Integer(string='City Rank', readonly=True)
+
     # Linked Properties
     property_ids = fields.One2many(
         'property.property',
@@ -96,6 +113,123 @@ class RealEstateAgent(models.Model):
     user_id = fields.Many2one('res.users', string='Portal User', readonly=True,
                               help='Portal login account for this agent')
 
+    # Fields that change an agent's position on the leaderboard
+    _LEADERBOARD_FIELDS = {'total_sales_volume', 'total_deals', 'is_active', 'city'}
+
+    def init(self):
+        # Backs _order, then partial indexes for each directory sort on active agents
+        tools.create_index(self.env.cr, 'real_estate_agent_sales_rank_idx', self._table,
+                           ['total_sales_volume DESC', 'total_deals DESC', 'id'])
+        tools.create_index(self.env.cr, 'real_estate_agent_deals_rank_idx', self._table,
+                           ['total_deals DESC', 'id'], where='is_active')
+        tools.create_index(self.env.cr, 'real_estate_agent_rating_rank_idx', self._table,
+                           ['avg_rating DESC', 'review_count DESC', 'id'], where='is_active')
+        tools.create_index(self.env.cr, 'real_estate_agent_city_rank_idx', self._table,
+                           ['city', 'city_rank'], where='is_active')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        agents = super().create(vals_list)
+        agents._refresh_leaderboard(set(agents.mapped('city')))
+        self.env['real.estate.cache.tag']._bump([self._name])
+        return agents
+
+    def write(self, vals):
+        written = set(vals)
+        if not self._LEADERBOARD_FIELDS & written:
+            return super().write(vals)
+        if self.env.context.get('defer_leaderboard'):
+            # The caller refreshes the leaderboard once for its whole batch
+            res = super().write(vals)
+        else:
+            cities = set(self.mapped('city'))
+            res = super().write(vals)
+            cities.update(self.mapped('city'))
+            # Moving city only reorders the city boards
+            self._refresh_leaderboard(cities, global_ranks=bool(written - {'city'}))
+        if {'city', 'is_active'} & written:
+            self.env['real.estate.cache.tag']._bump([self._name])
+        return res
+
+    def unlink(self):
+        cities = set(self.mapped('city'))
+        res = super().unlink()
+        self._refresh_leaderboard(cities)
+        self.env['real.estate.cache.tag']._bump([self._name])
+        return res
+
+    @api.model
+    def _refresh_leaderboard(self, cities=None, global_ranks=True):
+        """Recompute global and per-city ranks in SQL.
+
+        Only the given cities are re-ranked and only rows whose rank actually
+        moved are updated, so a deal recorded for one agent touches a handful
+        of rows instead of rewriting the whole table. Batch writers pass
+        ``defer_leaderboard`` in the context and call this once at the end.
+        """
+        self.env.flush_all()
+        cr = self.env.cr
+        updated = 0
+        if global_ranks:
+            cr.execute("""
+                UPDATE real_estate_agent a
+                   SET global_rank = r.rnk
+                  FROM (SELECT id, ROW_NUMBER() OVER (
+                               ORDER BY total_sales_volume DESC NULLS LAST, total_deals DESC NULLS LAST, id
+                           ) AS rnk
+                          FROM real_estate_agent
+                         WHERE is_active) r
+                 WHERE a.id = r.id AND a.global_rank IS DISTINCT FROM r.rnk
+            """)
+            updated += cr.rowcount
+        city_filter, params = "", []
+        if cities is not None:
+            # Agents without a city form their own groups: NULL and '' (as in the full refresh)
+            conditions = ["city IN %s"]
+            params.append(tuple(city for city in cities if city) or (None,))
+            if None in cities or False in cities:
+                conditions.append("city IS NULL")
+            if '' in cities:
+                conditions.append("city = ''")
+            city_filter = f"AND ({' OR '.join(conditions)})"
+        cr.execute(f"""
+            UPDATE real_estate_agent a
+               SET city_rank = r.rnk
+              FROM (SELECT id, ROW_NUMBER() OVER (
+                           PARTITION BY city
+                           ORDER BY total_sales_volume DESC NULLS LAST, total_deals DESC NULLS LAST, id
+                       ) AS rnk
+                      FROM real_estate_agent
+                     WHERE is_active {city_filter}) r
+             WHERE a.id = r.id AND a.city_rank IS DISTINCT FROM r.rnk
+        """, params)
+        updated += cr.rowcount
+        cr.execute("""
+            UPDATE real_estate_agent
+               SET global_rank = NULL, city_rank = NULL
+             WHERE NOT is_active AND (global_rank IS NOT NULL OR city_rank IS NOT NULL)
+        """)
+        updated += cr.rowcount
+        if updated:
+            self.invalidate_model(['global_rank', 'city_rank'])
+        return updated
+
+    @api.model
+    def _get_directory_cities(self):
+        """Sorted cities of active agents, cached until an agent's city or status changes"""
+        version = self.env['real.estate.cache.tag'].sudo()._get_versions([self._name]).get(self._name, 0)
+        return self._get_directory_cities_cached(version)
+
+    @api.model
+    @tools.ormcache('version')
+    def _get_directory_cities_cached(self, version):
+        self.env.cr.execute("""
+            SELECT DISTINCT city FROM real_estate_agent
+             WHERE is_active AND city IS NOT NULL AND city != ''
+             ORDER BY city
+        """)
+        return tuple(row[0] for row in self.env.cr.fetchall())
+
     @api.depends('property_ids', 'property_ids.is_published')
     def _compute_active_property_count(self):
         for agent in self:
@@ -173,16 +307,14 @@ class RealEstateAgent(models.Model):
                 # Link user to agent
                 agent.write({'user_id': user.id})
 
-                # Send password reset email
-                try:
-                    user.action_reset_password()
+                # Queue the set-password invitation (delivered by the mail queue cron)
+                if self._queue_portal_invitations(user):
                     message = _(
-                        'Portal user created successfully! Password reset email has been sent to %s') % agent.email
-                except Exception as e:
+                        'Portal user created successfully! A set-password email has been queued for %s') % agent.email
+                else:
                     message = _('Portal user created successfully! Please set password manually from Settings > Users.')
-                    _logger.warning(f"Could not send password reset email: {e}")
 
-                _logger.info(f"✅ Portal user created for agent: {agent.name} ({agent.email})")
+                _logger.info("Portal user %s created for agent %s", user.id, agent.id)
 
                 return {
                     'type': 'ir.actions.client',
@@ -196,10 +328,90 @@ class RealEstateAgent(models.Model):
                 }
 
             except Exception as e:
-                _logger.error(f"❌ Error creating portal user for {agent.name}: {str(e)}")
+                _logger.error("Portal user creation failed for agent %s: %s", agent.id, e)
                 raise UserError(_('Failed to create portal user: %s') % str(e))
 
 
+    @api.model
+    def _queue_portal_invitations(self, users):
+        """Queue set-password invitations for new portal users.
+
+        Unlike ``action_reset_password`` this never talks to SMTP inside the
+        current request: the emails are rendered in one batch and left in the
+        outgoing queue for the mail cron.
+        """
+        template = self.env.ref('auth_signup.set_password_email', raise_if_not_found=False)
+        if not users or not template:
+            return False
+        users = users.sudo()
+        users.mapped('partner_id').signup_prepare(signup_type='signup')
+        template.sudo().with_context(create_user=True).send_mail_batch(users.ids)
+        return True
+
+    @api.model
+    def _cron_refresh_windowed_metrics(self):
+        """Precompute the 90-day and 1-year deal metrics from the ledger"""
+        Ledger = self.env['real.estate.agent.ledger'].sudo()
+        now = fields.Datetime.now()
+        windows = {}
+        for suffix, days in (('90d', 90), ('365d', 365)):
+            window = defaultdict(lambda: [0.0, 0])
+            for agent, entry_type, amount, count in Ledger._read_group(
+                    [('entry_type', 'in', ('deal', 'reversal')),
+                     ('date', '>=', now - timedelta(days=days))],
+                    groupby=['agent_id', 'entry_type'],
+                    aggregates=['amount:sum', '__count']):
+                window[agent.id][0] += amount
+                window[agent.id][1] += count if entry_type == 'deal' else -count
+            windows[suffix] = window
+
+        # Agents with ledger activity in the last year, plus those whose
+        # stale windowed values must drop back to zero
+        agents = self.sudo().search([
+            '|', '|', ('id', 'in', list(windows['365d'])),
+            ('deals_365d', '!=', 0), ('sales_volume_365d', '!=', 0),
+        ])
+        for agent in agents:
+            vals = {}
+            for suffix, window in windows.items():
+                volume, count = window.get(agent.id, (0.0, 0))
+                vals[f'sales_volume_{suffix}'] = volume
+                vals[f'deals_{suffix}'] = max(count, 0)
+            if any(agent[name] != value for name, value in vals.items()):
+                agent.write(vals)
+        _logger.info("Refreshed windowed metrics for %s agents", len(agents))
+
+    def action_rebuild_metrics(self):
+        """Recompute the running totals of these agents from the full ledger"""
+        Ledger = self.env['real.estate.agent.ledger'].sudo()
+        domain = [('agent_id', 'in', self.ids)]
+        totals = defaultdict(lambda: {'volume': 0.0, 'deals': 0, 'rating_sum': 0.0, 'reviews': 0})
+        for agent, entry_type, amount, rating, count in Ledger._read_group(
+                domain, groupby=['agent_id', 'entry_type'],
+                aggregates=['amount:sum', 'rating:sum', '__count']):
+            total = totals[agent.id]
+            if entry_type == 'deal':
+                total['volume'] += amount
+                total['deals'] += count
+            elif entry_type == 'reversal':
+                total['volume'] += amount
+                total['deals'] -= count
+            elif entry_type == 'review':
+                total['rating_sum'] += rating
+                total['reviews'] += count
+
+        for agent in self.sudo().with_context(defer_leaderboard=True):
+            total = totals[agent.id]
+            agent.write({
+                'total_sales_volume': total['volume'],
+                'total_deals': max(total['deals'], 0),
+                'review_count': total['reviews'],
+                'rating_sum': total['rating_sum'],
+                'avg_rating': round(total['rating_sum'] / total['reviews'], 1) if total['reviews'] else 5.0,
+            })
+        self._refresh_leaderboard(set(self.mapped('city')))
+        return True
+
     def action_view_properties(self):
         """View all properties assigned to this agent"""
         return {
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError, ValidationError
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class RealEstateAgentLedger(models.Model):
+    """Append-only ledger of closed deals and client reviews.
+
+    Every entry is folded into the agent's aggregate metrics when it is
+    created, so the agent record always holds the running totals and
+    ranking queries never need to scan this table.
+    """
+    _name = 'real.estate.agent.ledger'
+    _description = 'Agent Deal & Review Ledger'
+    _order = 'date desc, id desc'
+
+    agent_id = fields.Many2one('real.estate.agent', string='Agent', required=True,
+                               index=True, ondelete='cascade')
+    property_id = fields.Many2one('property.property', string='Property',
+                                  index='btree_not_null', ondelete='set null')
+    entry_type = fields.Selection([
+        ('deal', 'Deal Closed'),
+        ('reversal', 'Deal Reverted'),
+        ('review', 'Client Review'),
+    ], string='Entry Type', required=True, default='deal')
+    date = fields.Datetime(string='Date', required=True, index=True, default=fields.Datetime.now)
+    amount = fields.Monetary(string='Amount', currency_field='currency_id',
+                             help='Deal value. Reversals carry the negated value of the deal they undo.')
+    currency_id = fields.Many2one(related='agent_id.currency_id', store=True)
+    rating = fields.Float(string='Rating', digits=(2, 1))
+    note = fields.Char(string='Note')
+
+    @api.constrains('entry_type', 'rating')
+    def _check_rating(self):
+        for entry in self:
+            if entry.entry_type == 'review' and not 0 <= entry.rating <= 5:
+                raise ValidationError(_("Rating must be between 0 and 5"))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        entries = super().create(vals_list)
+        entries._apply_to_agents()
+        return entries
+
+    def write(self, vals):
+        if set(vals) & {'agent_id', 'property_id', 'entry_type', 'date', 'amount', 'rating'}:
+            raise UserError(_("Ledger entries cannot be modified. Record a reversal instead."))
+        return super().write(vals)
+
+    def unlink(self):
+        raise UserError(_("Ledger entries cannot be deleted. Record a reversal instead."))
+
+    def _apply_to_agents(self):
+        """Fold these entries into their agents' running totals (one write per
+        agent, then one leaderboard refresh for the batch)."""
+        deltas = defaultdict(lambda: {'volume': 0.0, 'deals': 0, 'rating_sum': 0.0, 'reviews': 0})
+        for entry in self:
+            delta = deltas[entry.agent_id]
+            if entry.entry_type == 'deal':
+                delta['volume'] += entry.amount
+                delta['deals'] += 1
+            elif entry.entry_type == 'reversal':
+                delta['volume'] += entry.amount
+                delta['deals'] -= 1
+            elif entry.entry_type == 'review':
+                delta['rating_sum'] += entry.rating
+                delta['reviews'] += 1
+
+        updated = self.env['real.estate.agent'].sudo()
+        for agent, delta in deltas.items():
+            agent = agent.sudo().with_context(defer_leaderboard=True)
+            vals = {}
+            if delta['volume'] or delta['deals']:
+                vals['total_sales_volume'] = agent.total_sales_volume + delta['volume']
+                vals['total_deals'] = max(agent.total_deals + delta['deals'], 0)
+            if delta['reviews']:
+                # Running mean over the unrounded total: a rounded average would stick
+                count = agent.review_count + delta['reviews']
+                rating_sum = agent.rating_sum + delta['rating_sum']
+                vals['review_count'] = count
+                vals['rating_sum'] = rating_sum
+                vals['avg_rating'] = round(rating_sum / count, 1)
+            if vals:
+                agent.write(vals)
+                updated |= agent
+        if updated:
+            updated._refresh_leaderboard(set(updated.mapped('city')))
+
+    @api.model
+    def _record_status_changes(self, properties, old_statuses):
+        """Create deal/reversal entries for properties whose status moved to or from 'sold'.
+
+        A reversal undoes the property's latest deal (same agent, negated
+        amount), so later price or agent edits cannot skew the totals.
+
+        :param properties: property.property records after the write
+        :param old_statuses: dict {property_id: status before the write}
+        """
+        vals_list = []
+        reverted = properties.browse()
+        for prop in properties:
+            was_sold = old_statuses.get(prop.id) == 'sold'
+            is_sold = prop.status == 'sold'
+            if is_sold and not was_sold and prop.agent_id:
+                vals_list.append({
+                    'agent_id': prop.agent_id.id,
+                    'property_id': prop.id,
+                    'entry_type': 'deal',
+                    'amount': prop.price,
+                })
+            elif was_sold and not is_sold:
+                reverted |= prop
+
+        if reverted:
+            last_deals = {}
+            for deal in self.sudo().search([
+                ('property_id', 'in', reverted.ids),
+                ('entry_type', '=', 'deal'),
+            ]):
+                # Ordered by date desc: keep the first (latest) deal per property
+                last_deals.setdefault(deal.property_id.id, deal)
+            for prop in reverted:
+                deal = last_deals.get(prop.id)
+                if not deal:
+                    continue
+                vals_list.append({
+                    'agent_id': deal.agent_id.id,
+                    'property_id': prop.id,
+                    'entry_type': 'reversal',
+                    'amount': -deal.amount,
+                    'note': _('Status changed to %s', prop.status),
+                })
+
+        if vals_list:
+            self.sudo().create(vals_list)
+            _logger.info("Recorded %s agent ledger entries from status changes", len(vals_list))
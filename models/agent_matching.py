@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+
+from odoo import models, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class RealEstateAgentMatcher(models.AbstractModel):
+    """Scores available agents against properties and assigns the best match.
+
+    All candidate data is loaded once per batch (agents, their specializations
+    and their current load) and indexed by city and category in memory, so
+    assigning a large batch costs a fixed handful of queries plus one write
+    per chosen agent.
+    """
+    _name = 'real.estate.agent.matcher'
+    _description = 'Agent Matching Engine'
+
+    # Score weights
+    CITY_WEIGHT = 50.0
+    SPECIALIZATION_WEIGHT = 30.0
+    RATING_WEIGHT = 10.0
+    LOAD_PENALTY = 2.0
+
+    @api.model
+    def _load_candidates(self):
+        """Build the candidate indexes for one assignment batch.
+
+        :return: tuple (agents, by_city, by_category, load) where ``agents``
+            maps agent id to its data dict, ``by_city`` maps a normalized city
+            to agent ids, ``by_category`` maps a category id to agent ids and
+            ``load`` maps agent id to its count of unsold properties
+        """
+        Agent = self.env['real.estate.agent'].sudo()
+        agents = {
+            data['id']: data
+            for data in Agent.search_read(
+                [('is_active', '=', True), ('is_accepting_clients', '=', True)],
+                ['city', 'specializations', 'avg_rating'],
+            )
+        }
+        by_city = defaultdict(set)
+        by_category = defaultdict(set)
+        for agent_id, data in agents.items():
+            if data['city']:
+                by_city[data['city'].strip().lower()].add(agent_id)
+            for category_id in data['specializations']:
+                by_category[category_id].add(agent_id)
+
+        load = defaultdict(int)
+        if agents:
+            for agent, count in self.env['property.property'].sudo()._read_group(
+                    [('agent_id', 'in', list(agents)), ('status', '!=', 'sold')],
+                    groupby=['agent_id'], aggregates=['__count']):
+                load[agent.id] = count
+        return agents, by_city, by_category, load
+
+    @api.model
+    def _score(self, agent, city_match, specialization_match, load):
+        return (
+            self.CITY_WEIGHT * city_match
+            + self.SPECIALIZATION_WEIGHT * specialization_match
+            + self.RATING_WEIGHT * (agent['avg_rating'] or 0.0) / 5.0
+            - self.LOAD_PENALTY * load
+        )
+
+    @api.model
+    def assign(self, properties):
+        """Assign the best-scoring agent to each of the given properties.
+
+        Properties that already have an agent are left untouched. Load is
+        updated in memory as the batch is assigned, so a batch of listings in
+        one city is spread across that city's agents instead of all going to
+        the top-rated one.
+
+        :return: dict {property_id: agent_id} of the assignments made
+        """
+        properties = properties.filtered(lambda p: not p.agent_id)
+        if not properties:
+            return {}
+
+        agents, by_city, by_category, load = self._load_candidates()
+        if not agents:
+            _logger.info("No agents accepting clients, %s properties left unassigned", len(properties))
+            return {}
+
+        assignments = {}
+        for prop in properties:
+            city_agents = by_city.get((prop.city or '').strip().lower(), set())
+            category_agents = by_category.get(prop.category_id.id, set())
+            # Prefer agents working in the property's city, then specialists, then anyone
+            candidates = city_agents or category_agents or agents.keys()
+            best = max(
+                candidates,
+                key=lambda agent_id: (
+                    self._score(agents[agent_id], agent_id in city_agents,
+                                agent_id in category_agents, load[agent_id]),
+                    -agent_id,
+                ),
+            )
+            assignments[prop.id] = best
+            load[best] += 1
+
+        by_agent = defaultdict(list)
+        for property_id, agent_id in assignments.items():
+            by_agent[agent_id].append(property_id)
+        Property = self.env['property.property'].sudo()
+        for agent_id, property_ids in by_agent.items():
+            Property.browse(property_ids).write({'agent_id': agent_id})
+
+        _logger.info("Assigned %s properties to %s agents", len(assignments), len(by_agent))
+        return assignments
@@ -3,6 +3,8 @@ from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 import logging
 
+from .. import instrumentation
+
 _logger = logging.getLogger(__name__)
 
 
@@ -148,6 +150,7 @@ class AgentRegistration(models.Model):
     #         _logger.error(f"Error: {str(e)}")
     #         raise ValidationError(f"Error creating agent: {str(e)}")
 
+    @instrumentation.instrument
     def action_approve(self):
         """Approve and create agent + portal user"""
         self.ensure_one()
@@ -214,7 +217,7 @@ class AgentRegistration(models.Model):
             }
 
         except Exception as e:
-            _logger.error(f"Error: {str(e)}")
+            _logger.error("Approval failed for agent registration %s: %s", self.id, e)
             raise ValidationError(f"Error: {str(e)}")
 
     def _create_portal_user_for_agent(self, agent):
@@ -225,7 +228,7 @@ class AgentRegistration(models.Model):
         ], limit=1)
 
         if existing_user:
-            _logger.info(f"User already exists: {self.email}")
+            _logger.info("Agent registration %s reuses existing user %s", self.id, existing_user.id)
             return existing_user
 
         # Get portal group
@@ -253,24 +256,25 @@ class AgentRegistration(models.Model):
 
         user = self.env['res.users'].sudo().create(user_vals)
 
-        # Send password reset email
-        user.sudo().action_reset_password()
+        # Queue the set-password invitation instead of sending it inline
+        self.env['real.estate.agent']._queue_portal_invitations(user)
 
-        _logger.info(f"✅ Portal user created: {agent.name} ({self.email})")
+        _logger.info("Portal user %s created for agent %s", user.id, agent.id)
 
         return user
 
     def action_reject(self):
-        self.ensure_one()
-        if self.status == 'rejected':
+        """Open the reject wizard for one or many registrations"""
+        to_reject = self.filtered(lambda r: r.status != 'rejected')
+        if not to_reject:
             raise ValidationError("Already rejected!")
         return {
-            'name': 'Reject Registration',
+            'name': 'Reject Registration' if len(to_reject) == 1 else 'Reject Registrations',
             'type': 'ir.actions.act_window',
             'res_model': 'agent.registration.reject.wizard',
             'view_mode': 'form',
             'target': 'new',
-            'context': {'default_registration_id': self.id}
+            'context': {'default_registration_ids': [(6, 0, to_reject.ids)]}
         }
 
     def action_view_agent_profile(self):
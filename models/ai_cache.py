@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+from datetime import timedelta
+
+from odoo import models, fields, api
+import logging
+
+from .. import instrumentation
+
+_logger = logging.getLogger(__name__)
+
+
+class RealEstateAICache(models.Model):
+    """Persistent cache of AI provider answers.
+
+    Entries are keyed by a hash of the model, the generation parameters and
+    the normalized prompt, so duplicate listings and regenerations are
+    answered without calling the provider again. Entries expire after
+    ``real_estate_management.ai_cache_ttl_days`` days and the table is capped
+    at ``real_estate_management.ai_cache_max_entries`` entries, least recently
+    used first, by a daily cron.
+
+    Lookups and stores run in plain SQL: they happen during public page views
+    and must neither need access rights nor conflict between workers.
+    """
+    _name = 'real.estate.ai.cache'
+    _description = 'AI Response Cache'
+    _order = 'last_used desc'
+    _rec_name = 'key'
+
+    TTL_DAYS = 30
+    MAX_ENTRIES = 5000
+
+    key = fields.Char(string='Key', required=True, readonly=True, index=True)
+    model_name = fields.Char(string='Model', readonly=True)
+    prompt = fields.Text(string='Prompt', readonly=True)
+    response = fields.Text(string='Response', readonly=True)
+    hit_count = fields.Integer(string='Hits', readonly=True)
+    miss_count = fields.Integer(string='Misses', default=1, readonly=True)
+    hit_rate = fields.Float(string='Hit Rate (%)', readonly=True, aggregator='avg')
+    refreshed_date = fields.Datetime(string='Fetched On', readonly=True)
+    last_used = fields.Datetime(string='Last Used', readonly=True)
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(key)', 'AI cache keys must be unique.'),
+    ]
+
+    @api.model
+    def _make_key(self, model_name, params, prompt):
+        normalized = ' '.join(prompt.split()).casefold()
+        blob = json.dumps([model_name, params, normalized], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    @api.model
+    def _ttl(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'real_estate_management.ai_cache_ttl_days', self.TTL_DAYS))
+
+    @api.model
+    def _lookup(self, model_name, params, prompt):
+        """Return the cached answer (decoded JSON) or None on a miss"""
+        key = self._make_key(model_name, params, prompt)
+        self.env.cr.execute("""
+            UPDATE real_estate_ai_cache
+               SET hit_count = hit_count + 1,
+                   hit_rate = 100.0 * (hit_count + 1) / (hit_count + 1 + miss_count),
+                   last_used = now() at time zone 'UTC'
+             WHERE key = %s AND refreshed_date > (now() at time zone 'UTC') - %s * interval '1 day'
+         RETURNING response
+        """, [key, self._ttl()])
+        row = self.env.cr.fetchone()
+        instrumentation.registry.inc('real_estate_ai_cache_total', result='hit' if row else 'miss')
+        if not row:
+            return None
+        _logger.debug("AI cache hit %s", key[:12])
+        return json.loads(row[0])
+
+    @api.model
+    def _store(self, model_name, params, prompt, data):
+        """Store an answer, refreshing the entry if it expired"""
+        self.env.cr.execute("""
+            INSERT INTO real_estate_ai_cache
+                   (key, model_name, prompt, response, hit_count, miss_count, hit_rate,
+                    refreshed_date, last_used, create_date, write_date)
+            VALUES (%s, %s, %s, %s, 0, 1, 0, now() at time zone 'UTC', now() at time zone 'UTC',
+                    now() at time zone 'UTC', now() at time zone 'UTC')
+            ON CONFLICT (key) DO UPDATE
+               SET response = EXCLUDED.response,
+                   miss_count = real_estate_ai_cache.miss_count + 1,
+                   hit_rate = 100.0 * real_estate_ai_cache.hit_count
+                              / (real_estate_ai_cache.hit_count + real_estate_ai_cache.miss_count + 1),
+                   refreshed_date = EXCLUDED.refreshed_date,
+                   last_used = EXCLUDED.last_used,
+                   write_date = EXCLUDED.write_date
+        """, [self._make_key(model_name, params, prompt), model_name, prompt,
+              json.dumps(data, ensure_ascii=False)])
+
+    @api.model
+    def _cron_evict(self):
+        """Drop expired entries, then the least recently used beyond the size cap"""
+        max_entries = int(self.env['ir.config_parameter'].sudo().get_param(
+            'real_estate_management.ai_cache_max_entries', self.MAX_ENTRIES))
+        cutoff = fields.Datetime.now() - timedelta(days=self._ttl())
+        expired = self.search([('refreshed_date', '<', cutoff)])
+        overflow = self.search([('id', 'not in', expired.ids)], order='last_used desc, id desc', offset=max_entries)
+        (expired | overflow).unlink()
+        if expired or overflow:
+            _logger.info("AI cache: evicted %s expired and %s least recently used entries", len(expired), len(overflow))
+        return len(expired) + len(overflow)
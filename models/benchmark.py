@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+import base64
+import json
+import random
+import secrets
+import statistics
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api, release, _
+from odoo.exceptions import UserError
+from odoo.tools import SQL, split_every
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# (city, state code, latitude, longitude, weight): a few big metros and a long tail
+BENCHMARK_CITIES = [
+    ('Hyderabad', 'TS', 17.3850, 78.4867, 30),
+    ('Bengaluru', 'KA', 12.9716, 77.5946, 25),
+    ('Chennai', 'TN', 13.0827, 80.2707, 12),
+    ('Pune', 'MH', 18.5204, 73.8567, 10),
+    ('Mumbai', 'MH', 19.0760, 72.8777, 8),
+    ('Vijayawada', 'AP', 16.5062, 80.6480, 6),
+    ('Visakhapatnam', 'AP', 17.6868, 83.2185, 5),
+    ('Warangal', 'TS', 17.9689, 79.5941, 4),
+]
+BENCHMARK_CATEGORIES = ['Open Plot', 'Villa Plot', 'Farm Land', 'Commercial Plot', 'Gated Community Plot']
+
+# (name, path): formatted with a sample property id and city on each iteration
+PUBLIC_ROUTES = [
+    ('property_map', '/'),
+    ('property_map_city', '/?city={city}'),
+    ('property_listing', '/properties'),
+    ('property_listing_search', '/properties?search={city}'),
+    ('property_detail', '/property/{property_id}'),
+]
+AGENT_ROUTES = [
+    ('agent_directory', '/agents'),
+    ('agent_dashboard', '/my/agent/dashboard'),
+    ('agent_my_properties', '/my/agent/properties'),
+    ('agent_add_property_form', '/my/agent/property/add'),
+]
+
+BENCHMARK_LOGIN = 'benchmark.agent@example.com'
+
+# 1x1 PNG used for every generated gallery image
+PIXEL_PNG = base64.b64decode(
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==')
+
+
+class RealEstateBenchmark(models.AbstractModel):
+    """Synthetic catalogue generator and route benchmark.
+
+    Meant for a throwaway database, from ``odoo-bin shell``::
+
+        env['real.estate.benchmark']._generate_catalogue(100000)
+        env.cr.commit()
+        env['real.estate.benchmark']._run(output='/tmp/bench-100k.json', explain=True)
+
+    Routes are requested in-process through a werkzeug client on the Odoo
+    WSGI application, so the numbers include routing, rendering and SQL but
+    not the network. SQL counts come from the process-wide statement counter:
+    run on an otherwise idle server. ``explain=True`` adds the EXPLAIN ANALYZE
+    plans of the listing queries with and without the property indexes.
+    """
+    _name = 'real.estate.benchmark'
+    _description = 'Real Estate Benchmark'
+
+    # -------------------- data generator --------------------
+    @api.model
+    def _generate_catalogue(self, properties=10000, agents=None, gallery_images=3, seed=42, batch_size=5000):
+        """Create ``properties`` published listings with their agents and categories.
+
+        Cities follow a skewed distribution and coordinates are spread around
+        each city centre, so map and city filters see realistic cardinalities.
+        """
+        rng = random.Random(seed)
+        agents = agents or max(properties // 200, 10)
+        states = {
+            state.code: state.id
+            for state in self.env['res.country.state'].search([('country_id.code', '=', 'IN')])
+        }
+        cities = [city for city in BENCHMARK_CITIES if city[1] in states]
+        weights = [city[4] for city in cities]
+
+        Category = self.env['property.category']
+        categories = Category.search([('name', 'in', BENCHMARK_CATEGORIES)])
+        missing = set(BENCHMARK_CATEGORIES) - set(categories.mapped('name'))
+        categories |= Category.create([{'name': name, 'seo_title': f'{name} for Sale'} for name in sorted(missing)])
+
+        Agent = self.env['real.estate.agent'].with_context(tracking_disable=True, mail_create_nolog=True)
+        agent_records = Agent.create([{
+            'name': f'Benchmark Agent {i}',
+            'email': f'benchmark.agent.{i}@example.com',
+            'phone': f'+91 90000 {i:05d}',
+            'city': city[0],
+            'state_id': states[city[1]],
+            'specializations': [(6, 0, rng.sample(categories.ids, 2))],
+        } for i, city in enumerate(rng.choices(cities, weights, k=agents))])
+        self._create_benchmark_user(agent_records[0])
+
+        # A shared pool of small attachments stands in for gallery photos
+        pool = self.env['ir.attachment'].create([{
+            'name': f'benchmark-gallery-{i}.png',
+            'raw': PIXEL_PNG,
+            'mimetype': 'image/png',
+            'public': True,
+        } for i in range(50)])
+
+        Property = self.env['property.property'].with_context(
+            tracking_disable=True, mail_create_nolog=True, mail_create_nosubscribe=True)
+        started = time.monotonic()
+        created = 0
+        for batch in split_every(batch_size, range(properties)):
+            vals_list = []
+            for i in batch:
+                city, state_code, lat, lon, _weight = rng.choices(cities, weights)[0]
+                plot_area = rng.choice([1200, 1800, 2400, 3600, 4800, 9000])
+                price = round(plot_area * rng.lognormvariate(8.3, 0.5), -3)
+                vals_list.append({
+                    'name': f'{city} Plot {i}',
+                    'category_id': rng.choice(categories.ids),
+                    'agent_id': rng.choice(agent_records.ids),
+                    'price': price,
+                    'plot_area': plot_area,
+                    'facing_direction': rng.choice(['north', 'south', 'east', 'west', 'northeast']),
+                    'road_width': rng.choice([20.0, 30.0, 40.0, 60.0]),
+                    'title_status': rng.choice(['clear', 'registered', 'rera', 'dtcp']),
+                    'status': rng.choices(['available', 'sold', 'rented'], [80, 15, 5])[0],
+                    'is_published': rng.random() < 0.9,
+                    'is_featured': rng.random() < 0.02,
+                    'street': f'Survey No. {rng.randint(1, 999)}',
+                    'city': city,
+                    'zip_code': f'{rng.randint(500001, 599999)}',
+                    'state_id': states[state_code],
+                    'latitude': rng.gauss(lat, 0.08),
+                    'longitude': rng.gauss(lon, 0.08),
+                    'date_localization': fields.Date.today(),
+                    'contact_name': 'Benchmark Builder',
+                    'contact_phone': '+91 90000 00000',
+                    'contact_email': 'builder@example.com',
+                    'nearby_landmarks': 'Ring road, schools, hospital',
+                    'seo_title': f'Plot for sale in {city}',
+                    'gallery_image_ids': [(6, 0, rng.sample(pool.ids, gallery_images))],
+                })
+            Property.create(vals_list)
+            created += len(vals_list)
+            self.env.flush_all()
+            self.env.invalidate_all()
+            _logger.info("Benchmark catalogue: %s/%s properties (%.0fs)", created, properties, time.monotonic() - started)
+        return {'properties': created, 'agents': len(agent_records), 'categories': len(categories)}
+
+    @api.model
+    def _create_benchmark_user(self, agent):
+        """Portal user linked to an agent, used to time the agent portal routes.
+        Its password is random and replaced on every run (see ``_reset_benchmark_password``)."""
+        user = self.env['res.users'].with_context(active_test=False).search([('login', '=', BENCHMARK_LOGIN)])
+        if not user:
+            user = self.env['res.users'].with_context(no_reset_password=True).create({
+                'name': agent.name,
+                'login': BENCHMARK_LOGIN,
+                'password': secrets.token_urlsafe(32),
+                'groups_id': [(6, 0, [self.env.ref('base.group_portal').id])],
+            })
+        agent.write({'user_id': user.id})
+        return user
+
+    @api.model
+    def _reset_benchmark_password(self):
+        """Give the benchmark user a new random password and return it.
+
+        Committed, since the routes are requested through their own cursors;
+        the password only lives in memory for the duration of the run.
+        """
+        user = self.env['res.users'].sudo().search([('login', '=', BENCHMARK_LOGIN)])
+        if not user:
+            return None
+        password = secrets.token_urlsafe(32)
+        user.write({'password': password})
+        self.env.cr.commit()
+        return password
+
+    # -------------------- runner --------------------
+    @api.model
+    def _run(self, iterations=20, output=None, explain=False):
+        """Time every benchmarked route and return (and optionally write) the results.
+
+        :param explain: also compare the query plans of the listing queries
+            with and without the module's indexes (see ``_explain_indexes``)
+        :return: dict with, per route, p50/p95 wall time in ms, mean SQL
+            statements, mean response bytes and the process peak RSS
+        """
+        import resource  # Unix only, like the peak RSS figure it provides
+        from werkzeug.test import Client
+        from odoo import http, sql_db
+
+        Property = self.env['property.property'].sudo()
+        samples = Property.search([('is_published', '=', True)], limit=iterations, order='id desc')
+        cities = [city[0] for city in BENCHMARK_CITIES]
+        if not samples:
+            raise UserError(_("No published properties: generate a catalogue first."))
+
+        def time_routes(client, routes):
+            results = {}
+            for name, path in routes:
+                timings, queries, sizes = [], [], []
+                for i in range(iterations):
+                    url = path.format(property_id=samples[i % len(samples)].id, city=cities[i % len(cities)])
+                    counter = sql_db.sql_counter
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    body = response.get_data()
+                    timings.append((time.perf_counter() - start) * 1000)
+                    queries.append(sql_db.sql_counter - counter)
+                    sizes.append(len(body))
+                    if response.status_code >= 400:
+                        _logger.warning("Benchmark %s: %s returned %s", name, url, response.status_code)
+                timings.sort()
+                results[name] = {
+                    'path': path,
+                    'p50_ms': round(statistics.median(timings), 2),
+                    'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+                    'sql_queries': round(statistics.mean(queries), 1),
+                    'response_bytes': int(statistics.mean(sizes)),
+                    'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                }
+                _logger.info("Benchmark %s: %s", name, results[name])
+            return results
+
+        dbname = self.env.cr.dbname
+        client = Client(http.root)
+        client.get(f'/web?db={dbname}')
+        routes = time_routes(client, PUBLIC_ROUTES)
+
+        password = self._reset_benchmark_password()
+        if password:
+            client = Client(http.root)
+            client.post('/web/session/authenticate', json={'jsonrpc': '2.0', 'params': {
+                'db': dbname, 'login': BENCHMARK_LOGIN, 'password': password,
+            }})
+            routes.update(time_routes(client, AGENT_ROUTES))
+        else:
+            _logger.warning("Benchmark user %s not found, agent routes skipped", BENCHMARK_LOGIN)
+
+        results = {
+            'date': fields.Datetime.to_string(fields.Datetime.now()),
+            'odoo_version': release.version,
+            'module_version': self.env['ir.module.module'].sudo().search(
+                [('name', '=', 'real_estate_management')]).latest_version,
+            'iterations': iterations,
+            'catalogue': {
+                'properties': Property.with_context(active_test=False).search_count([]),
+                'published': Property.search_count([('is_published', '=', True)]),
+                'agents': self.env['real.estate.agent'].sudo().search_count([]),
+                'categories': self.env['property.category'].sudo().search_count([]),
+            },
+            'routes': routes,
+        }
+        if explain:
+            results['query_plans'] = self._explain_indexes()
+        if output:
+            with open(output, 'w') as f:
+                json.dump(results, f, indent=2)
+            _logger.info("Benchmark results written to %s", output)
+        return results
+
+    # -------------------- query plans --------------------
+    @api.model
+    def _index_benchmark_queries(self):
+        """(name, Query) of the listing queries the property indexes are meant for,
+        as the ORM builds them, with parameters sampled from the catalogue"""
+        Property = self.env['property.property'].sudo()
+        if not Property.search_count([('is_published', '=', True)], limit=1):
+            raise UserError(_("No published properties: generate a catalogue first."))
+        [(city, _count)] = Property._read_group(
+            [('is_published', '=', True)], ['city'], ['__count'], order='__count desc', limit=1)
+        sample = Property.search([('is_published', '=', True), ('category_id', '!=', False)], limit=1)
+        [(agent, _count)] = Property._read_group(
+            [('agent_id', '!=', False)], ['agent_id'], ['__count'], order='__count desc', limit=1)
+        cutoff = fields.Date.today() - timedelta(days=Property.ARCHIVE_SOLD_AFTER_DAYS)
+        return [
+            ('map_city', Property._search([
+                ('is_published', '=', True), ('latitude', '!=', False), ('longitude', '!=', False),
+                ('city', '=', city)], order='id')),
+            ('featured_city', Property._search([
+                ('is_published', '=', True), ('is_featured', '=', True), ('city', '=', city)], order='id')),
+            ('listing', Property._search([('is_published', '=', True), ('status', '!=', 'sold')], order='id')),
+            ('listing_city', Property._search([
+                ('is_published', '=', True), ('status', '!=', 'sold'), ('city', 'ilike', city)], order='id')),
+            ('similar', Property._search([
+                ('id', '!=', sample.id), ('category_id', '=', sample.category_id.id), ('is_published', '=', True),
+                ('price', '>=', sample.price * 0.8), ('price', '<=', sample.price * 1.2)], limit=3)),
+            ('agent_properties', Property.with_context(active_test=False)._search(
+                [('agent_id', '=', agent.id)], order='create_date desc')),
+            ('sold_archive', Property._search([('status', '=', 'sold'), ('sold_date', '<', cutoff)])),
+            ('geocoding_queue', Property._search([('geolocation_pending', '=', True)], limit=1000)),
+            ('changed_since', Property.with_context(active_test=False)._search(
+                [('write_date', '>', fields.Datetime.now() - timedelta(hours=1))], order='id')),
+        ]
+
+    @api.model
+    def _explain(self, query, runs=3):
+        """Plan summary of the fastest of ``runs`` EXPLAIN ANALYZE executions"""
+        best = None
+        for _i in range(runs):
+            self.env.cr.execute(SQL("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) %s", query.select()))
+            [[plan]] = self.env.cr.fetchone()
+            if best is None or plan['Execution Time'] < best['Execution Time']:
+                best = plan
+
+        def indexes(node):
+            found = [node['Index Name']] if 'Index Name' in node else []
+            for child in node.get('Plans', ()):
+                found += indexes(child)
+            return found
+
+        root = best['Plan']
+        return {
+            'execution_ms': round(best['Execution Time'], 3),
+            'planning_ms': round(best['Planning Time'], 3),
+            'node': root['Node Type'],
+            'indexes': indexes(root),
+            'rows': root['Actual Rows'],
+            'shared_blocks': root.get('Shared Hit Blocks', 0) + root.get('Shared Read Blocks', 0),
+        }
+
+    @api.model
+    def _explain_indexes(self):
+        """Compare the plans of the listing queries with and without the
+        indexes created by ``property.property.init()``.
+
+        The indexes are dropped in a savepoint that is rolled back, which
+        holds an exclusive lock on property_property until then: run it on
+        a benchmark database, not in production.
+
+        :return: {query name: {'with_indexes': plan, 'without_indexes': plan}}
+        """
+        cr = self.env.cr
+        self.env.flush_all()
+        cr.execute("ANALYZE property_property")
+        cr.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'property_property'")
+        # Module indexes (see property.property.init()), not the ORM's field indexes
+        index_names = [name for [name] in cr.fetchall() if name.endswith('_idx')]
+        queries = self._index_benchmark_queries()
+        plans = {name: {'with_indexes': self._explain(query)} for name, query in queries}
+        with cr.savepoint(flush=False) as savepoint:
+            try:
+                for name in index_names:
+                    cr.execute(SQL("DROP INDEX %s", SQL.identifier(name)))
+                for name, query in queries:
+                    plans[name]['without_indexes'] = self._explain(query)
+            finally:
+                savepoint.rollback()
+        for name, plan in plans.items():
+            _logger.info("Query plan %s: %s", name, plan)
+        return plans
+
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class RealEstateCacheTag(models.Model):
+    """Version counters for the public page caches.
+
+    Cached pages remember the version of every tag they depend on; bumping a
+    tag invalidates those pages in every worker without any cross-process
+    messaging, workers simply compare versions.
+    """
+    _name = 'real.estate.cache.tag'
+    _description = 'Page Cache Invalidation Tag'
+
+    name = fields.Char(string='Tag', required=True, readonly=True)
+    version = fields.Integer(string='Version', default=0, readonly=True)
+
+    _sql_constraints = [
+        ('name_uniq', 'unique(name)', 'Cache tags must be unique.'),
+    ]
+
+    @api.model
+    def _bump(self, tags):
+        """Increment the version of the given tags (creating them if needed).
+
+        The increment runs once the current transaction has committed, in a
+        short transaction of its own: concurrent writers do not queue on the
+        tag rows for the length of their transactions, and workers only see
+        a new version once the change it stands for is visible to them.
+        """
+        if not tags:
+            return
+        if self.env.registry.in_test_mode():
+            # Test cursors never commit, post-commit hooks would not run
+            self._increment(tags)
+            return
+        pending = self.env.cr.postcommit.data.setdefault(self._name, set())
+        if not pending:
+            registry, uid = self.env.registry, self.env.uid
+
+            @self.env.cr.postcommit.add
+            def increment():
+                try:
+                    with registry.cursor() as cr:
+                        api.Environment(cr, uid, {})[self._name]._increment(pending)
+                except Exception:
+                    _logger.exception("Cache tag bump failed for %s", sorted(pending))
+        pending.update(tags)
+
+    @api.model
+    def _increment(self, tags):
+        self.env.cr.execute("""
+            INSERT INTO real_estate_cache_tag (name, version, create_date, write_date)
+            SELECT tag, 1, now() at time zone 'UTC', now() at time zone 'UTC'
+              FROM unnest(%s::varchar[]) AS tag
+            ON CONFLICT (name) DO UPDATE
+               SET version = real_estate_cache_tag.version + 1,
+                   write_date = EXCLUDED.write_date
+        """, [sorted(set(tags))])
+        self.invalidate_model(['version'])
+
+    @api.model
+    def _get_versions(self, tags=None):
+        """Return {tag: version}; unknown tags are at version 0."""
+        if tags is None:
+            self.env.cr.execute("SELECT name, version FROM real_estate_cache_tag")
+        else:
+            self.env.cr.execute("SELECT name, version FROM real_estate_cache_tag WHERE name = ANY(%s)",
+                                [list(tags)])
+        return dict(self.env.cr.fetchall())
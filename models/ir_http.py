@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+
+from .. import instrumentation
+
+# Per-route SQL budgets are asserted by tests/test_route_budgets.py
+TIMED_CONTROLLERS = ('RealEstateController.', 'AgentPortalController.')
+
+
+class IrHttp(models.AbstractModel):
+    """Route metrics for the website and agent portal controllers: every
+    request to these controllers is timed, rendering included (see
+    ``instrumentation``)."""
+    _inherit = 'ir.http'
+
+    @classmethod
+    def _dispatch(cls, endpoint):
+        route = getattr(endpoint, '__qualname__', None) or getattr(getattr(endpoint, 'func', None), '__qualname__', '')
+        if not route.startswith(TIMED_CONTROLLERS):
+            return super()._dispatch(endpoint)
+        with instrumentation.timed('route', route) as measure:
+            response = super()._dispatch(endpoint)
+            # Templates render lazily: measure the rendering too
+            if getattr(response, 'is_qweb', False):
+                response.flatten()
+            measure.failed = getattr(response, 'status_code', 200) >= 500
+        return response
@@ -1,9 +1,38 @@
-from odoo import models, fields, api, _
+from datetime import timedelta
+
+from markupsafe import Markup
+
+from odoo import models, fields, api, tools, _
+from odoo.tools.lru import LRU
+
+from .. import instrumentation
+from ..ai_client import AIClientError, CircuitOpenError
+from ..ai_providers import get_provider
+from ..logging_utils import SampledLogger, redact
 import logging
-import requests
 import json
 
 _logger = logging.getLogger(__name__)
+# High-volume warnings (geocoding misses during imports, missing API key on
+# every page view) are logged for a sample of the events only
+_sampled_logger = SampledLogger(_logger, rate=20)
+
+# Rendered property cards, keyed by website, property id and write_date (see _render_cards)
+_card_cache = LRU(4096)
+
+# Seconds a page view may wait for the AI provider, retries included
+AI_DEADLINE = 20
+# Sections of the AI answers, and the bounds applied when storing them
+AI_CONTENT_SECTIONS = ('key_highlights', 'investment_data', 'nearby_places', 'unique_features', 'lifestyle_benefits')
+CITY_INVESTMENT_SECTIONS = ('investment_reasons', 'growth_potential', 'infrastructure', 'market_trends')
+AI_MAX_POINTS = 8
+AI_MAX_POINT_LENGTH = 400
+
+CARD_TEMPLATES = {
+    'listing': 'real_estate_management.property_card_listing',
+    'featured': 'real_estate_management.property_card_featured',
+    'similar': 'real_estate_management.property_card_similar',
+}
 
 
 class Property(models.Model):
@@ -42,13 +71,7 @@ class Property(models.Model):
         ('sold', 'Sold'),
         ('rented', 'Rented'),
     ], string='Property Status', default='available', tracking=True)
-
-    # ⭐ ADD THIS NEW COMPUTED FIELD
-    status_ribbon_html = fields.Html(
-        string='Status Ribbon HTML',
-        compute='_compute_status_ribbon_html',
-        sanitize=False
-    )
+    sold_date = fields.Date(string='Sold On', compute='_compute_sold_date', store=True, readonly=True)
 
     adhar_image = fields.Binary(
         string="Aadhaar Card*",
@@ -101,6 +124,9 @@ class Property(models.Model):
                              compute='_compute_geolocation', store=True)
     date_localization = fields.Date(string='Geolocation Date',
                                     compute='_compute_geolocation', store=True)
+    geolocation_pending = fields.Boolean(
+        string='Geocoding Pending', copy=False,
+        help='Set by bulk imports: the address is geocoded later by a scheduled action')
 
     # Contact Info
     contact_name = fields.Char(string='Contact Person*',required=True)
@@ -127,30 +153,58 @@ class Property(models.Model):
     )
 
     # Metadata
+    active = fields.Boolean(default=True, help='Long-sold listings are archived automatically')
     is_published = fields.Boolean(string='Published', default=False)
     views = fields.Integer(string='Views', default=0)
     last_viewed = fields.Datetime(string='Last Viewed')
     nearby_landmarks = fields.Text(string='Nearby Landmarks*',required=True)
 
-    # AI Content Fields
-    ai_key_highlights = fields.Html(readonly=True)
-    ai_investment_data = fields.Html(readonly=True)
-    ai_nearby_places = fields.Html(readonly=True)
-    ai_unique_features = fields.Html(readonly=True)
-    ai_lifestyle_benefits = fields.Html(readonly=True)
+    # AI Content Fields: {section: [points]} for the AI_CONTENT_SECTIONS, rendered by the templates
+    ai_content = fields.Json(readonly=True, copy=False)
+    ai_content_summary = fields.Text(string='AI Content', compute='_compute_ai_content_summary')
     ai_content_generated = fields.Boolean(default=False)
     ai_generation_date = fields.Datetime()
 
     # ==================== CITY INVESTMENT FIELDS ====================
-    city_investment_reasons = fields.Html(string='City Investment Reasons', readonly=True)
-    city_growth_potential = fields.Html(string='City Growth Potential', readonly=True)
-    city_infrastructure = fields.Html(string='City Infrastructure', readonly=True)
-    city_market_trends = fields.Html(string='City Market Trends', readonly=True)
+    # {section: [points]} for the CITY_INVESTMENT_SECTIONS
+    city_investment_data = fields.Json(string='City Investment Data', readonly=True, copy=False)
+    city_investment_summary = fields.Text(string='City Investment', compute='_compute_ai_content_summary')
     city_investment_generated = fields.Boolean(default=False)
     city_investment_date = fields.Datetime()
     last_city_processed = fields.Char(string='Last City Processed')
 
+    # Days a listing stays sold before the archival cron moves it out of the public tables
+    ARCHIVE_SOLD_AFTER_DAYS = 365
+
+    def init(self):
+        # Every public query filters on published (and active) listings: index
+        # only those rows, with the columns each page filters or sorts on
+        tools.create_index(self.env.cr, 'property_property_published_city_idx', self._table,
+                           ['is_published', 'city'], where='active')
+        tools.create_index(self.env.cr, 'property_property_available_idx', self._table,
+                           ['city', 'id'],
+                           where="is_published AND active AND (status != 'sold' OR status IS NULL)")
+        tools.create_index(self.env.cr, 'property_property_similar_idx', self._table,
+                           ['category_id', 'price'], where='is_published AND active')
+        tools.create_index(self.env.cr, 'property_property_featured_idx', self._table,
+                           ['city'], where='is_featured AND is_published AND active')
+        tools.create_index(self.env.cr, 'property_property_agent_created_idx', self._table,
+                           ['agent_id', 'create_date DESC'])
+        tools.create_index(self.env.cr, 'property_property_sold_archive_idx', self._table,
+                           ['sold_date'], where="status = 'sold' AND active")
+        # Incremental readers (listing snapshot refreshes, "changed since" feeds) range-scan write_date
+        tools.create_index(self.env.cr, 'property_property_write_date_idx', self._table, ['write_date'])
+        # Geocoding backlog (cron batches, metrics queue length): only the few pending rows
+        tools.create_index(self.env.cr, 'property_property_geolocation_pending_idx', self._table,
+                           ['id'], where='geolocation_pending')
+
     # -------------------- COMPUTE METHODS --------------------
+    @api.depends('status')
+    def _compute_sold_date(self):
+        today = fields.Date.context_today(self)
+        for rec in self:
+            rec.sold_date = (rec.sold_date or today) if rec.status == 'sold' else False
+
     @api.depends('price', 'plot_area')
     def _compute_price_per_sqft(self):
         for rec in self:
@@ -166,10 +220,18 @@ class Property(models.Model):
         for rec in self:
             rec.image_count = len(rec.gallery_image_ids)
 
-    @api.depends('street', 'street2', 'city', 'zip_code', 'state_id', 'country_id')
+    @api.depends('street', 'street2', 'city', 'zip_code', 'state_id', 'country_id', 'geolocation_pending')
+    @instrumentation.instrument
     def _compute_geolocation(self):
         geo = self.env['base.geocoder']
+        # Bulk geocoding (imports) often has many plots at one address: one lookup each
+        found = {}  # address -> coordinates
         for rec in self:
+            if rec.geolocation_pending:
+                # Geocoded by _cron_geocode_pending, clearing the flag recomputes
+                rec.latitude = rec.longitude = False
+                rec.date_localization = False
+                continue
             # Construct full address
             street = ' '.join(filter(None, [rec.street, rec.street2]))
             address_components = {
@@ -182,53 +244,227 @@ class Property(models.Model):
             if not (address_components['street'] or address_components['zip'] or address_components['city']):
                 rec.latitude = rec.longitude = False
                 rec.date_localization = False
-                _logger.info(f"Skipping geocode for {rec.name}: insufficient address info {address_components}")
+                _logger.debug("Skipping geocode for property %s: no address", rec.id)
                 continue
 
+            address_key = tuple(address_components.values())
             try:
-                # Log the query
-                _logger.info(f"Geocoding property {rec.name} with params: {address_components}")
-
-                # Query geocoder with structured parameters
-                query = geo.geo_query_address(**address_components)
-                coords = geo.geo_find(query, force_country=address_components['country'])
-
-                # Fallback: try single string query if structured fails
-                if not coords or len(coords) != 2:
-                    address_str = ', '.join(
-                        filter(None, [rec.street, rec.street2, rec.city, rec.state_id.name, rec.country_id.name]))
-                    _logger.info(
-                        f"Structured geocode failed for {rec.name}, trying fallback with address string: {address_str}")
-                    coords = geo.geo_find(address_str)
+                if address_key in found:
+                    coords = found[address_key]
+                else:
+                    _logger.debug("Geocoding property %s: %s", rec.id, address_components)
+
+                    # Query geocoder with structured parameters
+                    query = geo.geo_query_address(**address_components)
+                    with instrumentation.timed('external', 'geocoder', count_queries=False):
+                        coords = geo.geo_find(query, force_country=address_components['country'])
+
+                    # Fallback: try single string query if structured fails
+                    if not coords or len(coords) != 2:
+                        address_str = ', '.join(
+                            filter(None, [rec.street, rec.street2, rec.city, rec.state_id.name, rec.country_id.name]))
+                        _logger.debug("Structured geocode failed for property %s, trying %r", rec.id, address_str)
+                        with instrumentation.timed('external', 'geocoder', count_queries=False):
+                            coords = geo.geo_find(address_str)
+                    found[address_key] = coords
 
                 if coords and len(coords) == 2:
                     rec.latitude, rec.longitude = coords
                     rec.date_localization = fields.Date.context_today(rec)
-                    _logger.info(f"Geocoded {rec.name}: latitude={rec.latitude}, longitude={rec.longitude}")
+                    _logger.debug("Geocoded property %s: %s, %s", rec.id, rec.latitude, rec.longitude)
                 else:
                     rec.latitude = rec.longitude = False
                     rec.date_localization = False
-                    _logger.error(f"Geocode failed for {rec.name}: {address_components}")
+                    _sampled_logger.warning("No geocoding match for property %s", rec.id)
 
             except Exception as e:
                 rec.latitude = rec.longitude = False
                 rec.date_localization = False
-                _logger.error(f"Geocode error for {rec.name}: {e}")
+                _sampled_logger.warning("Geocoding error for property %s: %s", rec.id, e)
+
+    # -------------------- CRUD --------------------
+    # Fields not shown on public pages: writing them keeps the page cache warm
+    _CACHE_NEUTRAL_FIELDS = {'views', 'last_viewed'}
+
+    def _category_cache_tags(self):
+        """Cache tags of the categories of these properties: a detail page
+        only shows listings of its own category (see ``_detail_cache_tags``)"""
+        return [f'{self._name}:category:{category_id}' for category_id in {prop.category_id.id or 0 for prop in self}]
+
+    def _detail_cache_tags(self):
+        self.ensure_one()
+        return ('property.category', *self._category_cache_tags())
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['real.estate.cache.tag']._bump([self._name, *records._category_cache_tags()])
+        return records
+
+    def write(self, vals):
+        tags = []
+        if not self._CACHE_NEUTRAL_FIELDS.issuperset(vals):
+            tags = [self._name, *self._category_cache_tags()]
+        if 'status' not in vals:
+            res = super().write(vals)
+        else:
+            old_statuses = {rec.id: rec.status for rec in self}
+            res = super().write(vals)
+            # Feed agent performance from real status transitions
+            self.env['real.estate.agent.ledger']._record_status_changes(self, old_statuses)
+        if tags and 'category_id' in vals:
+            tags += self._category_cache_tags()
+        self.env['real.estate.cache.tag']._bump(tags)
+        return res
+
+    def unlink(self):
+        tags = [self._name, *self._category_cache_tags()]
+        res = super().unlink()
+        self.env['real.estate.cache.tag']._bump(tags)
+        return res
+
+    def _increment_views(self):
+        """Count a page view. Plain SQL so that write_date, which the HTTP
+        validators and the page caches are keyed on, does not move."""
+        self.env.cr.execute("""
+            UPDATE property_property
+               SET views = COALESCE(views, 0) + 1, last_viewed = now() AT TIME ZONE 'UTC'
+             WHERE id IN %s
+        """, [tuple(self.ids)])
+        self.invalidate_recordset(['views', 'last_viewed'])
+
+    # Pending rows geocoded per cron call; the cron runner calls again right
+    # away while rows remain (ir.cron._notify_progress)
+    GEOCODE_BATCH_SIZE = 1000
+
+    @api.model
+    def _cron_geocode_pending(self, limit=GEOCODE_BATCH_SIZE):
+        """Geocode a batch of the properties created by bulk imports.
+
+        Batches are ordered by address so that plots of the same street or
+        zip code share one geocoder lookup (see ``_compute_geolocation``).
+        """
+        properties = self.search([('geolocation_pending', '=', True)], limit=limit,
+                                 order='country_id, state_id, city, zip_code, street, street2, id')
+        if properties:
+            properties.write({'geolocation_pending': False})
+            _logger.info("Geocoded %s imported properties", len(properties))
+        remaining = self.search_count([('geolocation_pending', '=', True)]) if properties else 0
+        self.env['ir.cron']._notify_progress(done=len(properties), remaining=remaining)
+        return len(properties)
+
+    @api.model
+    def _cron_archive_sold_properties(self):
+        """Archive listings sold for longer than the configured number of days.
+
+        Archived rows drop out of every default search and out of the partial
+        indexes, so the public pages only ever scan the hot part of the table.
+        """
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'real_estate_management.archive_sold_after_days', self.ARCHIVE_SOLD_AFTER_DAYS))
+        cutoff = fields.Date.context_today(self) - timedelta(days=days)
+        properties = self.search([('status', '=', 'sold'), ('sold_date', '<', cutoff)])
+        if properties:
+            properties.write({'active': False})
+            _logger.info("Archived %s properties sold before %s", len(properties), cutoff)
+        return len(properties)
+
+    @api.model
+    def _ai_chat_json(self, provider, prompt, subject):
+        """Ask the AI provider for a JSON answer to ``prompt``.
+
+        Answers are cached in ``real.estate.ai.cache`` under the provider and
+        model, the generation parameters and the normalized prompt.
+
+        :return: the decoded JSON, or None when the provider failed or is
+            down (circuit open): callers then keep the content they have
+        """
+        messages = [
+            {'role': 'system', 'content': 'You are a real estate analyst. Return only JSON.'},
+            {'role': 'user', 'content': prompt}
+        ]
+        params = {'system': messages[0]['content'], 'max_tokens': 800, 'temperature': 0.3}
+        AICache = self.env['real.estate.ai.cache']
+        cached = AICache._lookup(provider.cache_namespace, params, prompt)
+        if cached is not None:
+            return cached
+
+        try:
+            response_text = provider.complete(messages, params['max_tokens'], params['temperature'], AI_DEADLINE)
+        except CircuitOpenError:
+            _sampled_logger.warning("AI provider %s unavailable, keeping existing AI content for %s", provider.name, subject)
+            return None
+        except AIClientError as e:
+            _logger.error("AI provider %s error for %s: %s", provider.name, subject, redact(str(e)))
+            return None
+
+        # Clean JSON
+        if response_text.startswith('```'):
+            lines = response_text.split('\n')
+            response_text = '\n'.join(lines[1:-1]) if len(lines) > 2 else response_text
+            response_text = response_text.replace('```json', '').replace('```', '').strip()
+
+        try:
+            data = json.loads(response_text)
+        except json.JSONDecodeError as e:
+            _logger.error("Invalid JSON from %s for %s: %s", provider.name, subject, e)
+            _logger.debug("AI response: %s", redact(response_text))
+            return None
+        AICache._store(provider.cache_namespace, params, prompt, data)
+        return data
+
+    @api.model
+    def _validate_ai_sections(self, data, sections):
+        """Keep the expected sections of an AI answer as lists of plain-text points.
+
+        A section given as a single string becomes one point; other values,
+        empty points and unknown sections are dropped and lists are bounded.
+        Points are stored as text and escaped when rendered.
+        """
+        if not isinstance(data, dict):
+            return {}
+        content = {}
+        for section in sections:
+            points = data.get(section)
+            if isinstance(points, (str, int, float)):
+                points = [points]
+            if not isinstance(points, list):
+                continue
+            points = [
+                str(point).strip()[:AI_MAX_POINT_LENGTH]
+                for point in points if isinstance(point, (str, int, float)) and str(point).strip()
+            ][:AI_MAX_POINTS]
+            if points:
+                content[section] = points
+        return content
+
+    @api.depends('ai_content', 'city_investment_data')
+    def _compute_ai_content_summary(self):
+        def summary(data, sections):
+            return '\n\n'.join(
+                '%s:\n%s' % (section.replace('_', ' ').capitalize(), '\n'.join(f'• {point}' for point in data[section]))
+                for section in sections if data.get(section)
+            ) if data else False
+
+        for rec in self:
+            rec.ai_content_summary = summary(rec.ai_content, AI_CONTENT_SECTIONS)
+            rec.city_investment_summary = summary(rec.city_investment_data, CITY_INVESTMENT_SECTIONS)
 
     # REPLACE your generate_ai_content and get_city_investment_info methods with these:
 
+    @instrumentation.instrument
     def generate_ai_content(self):
         """Generate AI content using FREE Groq API"""
         self.ensure_one()
 
-        # Get Groq API key (FREE from https://console.groq.com)
-        api_key = self.env['ir.config_parameter'].sudo().get_param('groq.api_key')
+        # Groq needs an API key (FREE from https://console.groq.com)
+        provider = get_provider(self.env)
 
-        if not api_key:
-            _logger.error("❌ Groq API key not configured. Get free key from https://console.groq.com")
+        if not provider.is_configured():
+            _sampled_logger.warning("Groq API key not configured, get a free key from https://console.groq.com")
             return False
 
-        _logger.info(f"🔄 Generating AI content for property: {self.name}")
+        _logger.info("Generating AI content for property %s", self.id)
 
         prompt = (
             f"Generate real estate data for '{self.name}' in {self.city}.\n"
@@ -242,80 +478,31 @@ class Property(models.Model):
             f"Return ONLY valid JSON."
         )
 
-        headers = {
-            'Authorization': f'Bearer {api_key}',
-            'Content-Type': 'application/json'
-        }
-
-        payload = {
-            'model': 'llama-3.3-70b-versatile',  # FREE Groq model
-            'messages': [
-                {'role': 'system', 'content': 'You are a real estate analyst. Return only JSON.'},
-                {'role': 'user', 'content': prompt}
-            ],
-            'max_tokens': 800,
-            'temperature': 0.3
-        }
-
         try:
-            _logger.info("📤 Calling FREE Groq API...")
-
-            response = requests.post(
-                'https://api.groq.com/openai/v1/chat/completions',  # Groq endpoint
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-
-            _logger.info(f"📥 Response status: {response.status_code}")
-
-            if response.status_code != 200:
-                _logger.error(f"API Error: {response.text}")
+            ai_data = self._ai_chat_json(provider, prompt, f'property {self.id}')
+            if ai_data is None:
                 return False
 
-            response_data = response.json()
-            response_text = response_data['choices'][0]['message']['content'].strip()
-
-            # Clean JSON
-            if response_text.startswith('```'):
-                lines = response_text.split('\n')
-                response_text = '\n'.join(lines[1:-1]) if len(lines) > 2 else response_text
-                response_text = response_text.replace('```json', '').replace('```', '').strip()
-
-            try:
-                ai_data = json.loads(response_text)
-                _logger.info(f"✅ Parsed AI data with keys: {list(ai_data.keys())}")
-            except json.JSONDecodeError as e:
-                _logger.error(f"JSON parse error: {e}\nResponse: {response_text}")
+            content = self._validate_ai_sections(ai_data, AI_CONTENT_SECTIONS)
+            if not content:
+                _logger.error("AI content for property %s has none of the expected sections", self.id)
                 return False
 
-            # Convert to HTML
-            def to_html(data):
-                if not data:
-                    return '<ul><li>Information not available</li></ul>'
-                if isinstance(data, list):
-                    items = ''.join([f'<li>{item}</li>' for item in data])
-                    return f'<ul>{items}</ul>'
-                return f'<ul><li>{data}</li></ul>'
-
             self.write({
-                'ai_key_highlights': to_html(ai_data.get('key_highlights', [])),
-                'ai_investment_data': to_html(ai_data.get('investment_data', [])),
-                'ai_nearby_places': to_html(ai_data.get('nearby_places', [])),
-                'ai_unique_features': to_html(ai_data.get('unique_features', [])),
-                'ai_lifestyle_benefits': to_html(ai_data.get('lifestyle_benefits', [])),
+                'ai_content': content,
                 'ai_content_generated': True,
                 'ai_generation_date': fields.Datetime.now(),
             })
 
-            _logger.info(f"✅ AI content saved for property: {self.name}")
+            _logger.info("AI content saved for property %s", self.id)
             return True
 
         except Exception as e:
-            _logger.error(f"❌ Error: {e}")
+            _logger.error("AI content generation failed for property %s: %s", self.id, e)
             return False
 
     @api.model
+    @instrumentation.instrument
     def get_city_investment_info(self, city_name):
         """Generate city investment info using FREE Groq API"""
         if not city_name:
@@ -328,31 +515,23 @@ class Property(models.Model):
         ], limit=1)
 
         if cached:
-            _logger.info(f"✅ Found cached city data for {city_name}")
-            return {
-                'city': city_name,
-                'ai_investment_reasons': cached.city_investment_reasons or '',
-                'ai_growth_potential': cached.city_growth_potential or '',
-                'ai_infrastructure': cached.city_infrastructure or '',
-                'ai_market_trends': cached.city_market_trends or '',
-                'ai_content_generated': True,
-            }
+            _logger.debug("Found cached city data for %s", city_name)
+            return dict(cached.city_investment_data or {}, city=city_name, ai_content_generated=True)
 
-        # Get Groq API key
-        api_key = self.env['ir.config_parameter'].sudo().get_param('groq.api_key')
+        provider = get_provider(self.env)
 
-        if not api_key:
-            _logger.error("❌ Groq API key not configured")
+        if not provider.is_configured():
+            _sampled_logger.warning("Groq API key not configured, get a free key from https://console.groq.com")
             return {
                 'city': city_name,
-                'ai_investment_reasons': '<p>Please configure Groq API key to see investment data.</p>',
-                'ai_growth_potential': '<p>Get free API key from https://console.groq.com</p>',
-                'ai_infrastructure': '<p>Configuration needed.</p>',
-                'ai_market_trends': '<p>Configuration needed.</p>',
+                'investment_reasons': ['Please configure Groq API key to see investment data.'],
+                'growth_potential': ['Get free API key from https://console.groq.com'],
+                'infrastructure': ['Configuration needed.'],
+                'market_trends': ['Configuration needed.'],
                 'ai_content_generated': False,
             }
 
-        _logger.info(f"📝 Generating city investment data for: {city_name}")
+        _logger.info("Generating city investment data for %s", city_name)
 
         prompt = (
             f"Create real estate investment summary for {city_name}, India.\n\n"
@@ -364,67 +543,16 @@ class Property(models.Model):
             f"Return ONLY valid JSON."
         )
 
-        headers = {
-            'Authorization': f'Bearer {api_key}',
-            'Content-Type': 'application/json'
-        }
-
-        payload = {
-            'model': 'llama-3.3-70b-versatile',
-            'messages': [
-                {'role': 'system', 'content': 'You are a real estate analyst. Return only JSON.'},
-                {'role': 'user', 'content': prompt}
-            ],
-            'max_tokens': 800,
-            'temperature': 0.3
-        }
-
         try:
-            _logger.info("📤 Calling Groq API for city data...")
-
-            response = requests.post(
-                'https://api.groq.com/openai/v1/chat/completions',
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-
-            if response.status_code != 200:
-                _logger.error(f"API Error: {response.text}")
+            city_data = self._ai_chat_json(provider, prompt, f'city {city_name}')
+            if city_data is None:
                 return None
 
-            response_data = response.json()
-            response_text = response_data['choices'][0]['message']['content'].strip()
-
-            # Clean JSON
-            if response_text.startswith('```'):
-                lines = response_text.split('\n')
-                response_text = '\n'.join(lines[1:-1]) if len(lines) > 2 else response_text
-                response_text = response_text.replace('```json', '').replace('```', '').strip()
-
-            try:
-                city_data = json.loads(response_text)
-                _logger.info(f"✅ Parsed city data with keys: {list(city_data.keys())}")
-            except json.JSONDecodeError as e:
-                _logger.error(f"JSON parse error: {e}")
+            city_data = self._validate_ai_sections(city_data, CITY_INVESTMENT_SECTIONS)
+            if not city_data:
+                _logger.error("City data for %s has none of the expected sections", city_name)
                 return None
 
-            # Convert to HTML
-            def to_html(data):
-                if not data:
-                    return '<p>Information not available.</p>'
-                if isinstance(data, list):
-                    items = ''.join([f'<li>{item}</li>' for item in data])
-                    return f'<ul>{items}</ul>'
-                if isinstance(data, str):
-                    return f'<p>{data}</p>'
-                return '<p>Information not available.</p>'
-
-            investment_reasons = to_html(city_data.get('investment_reasons', ''))
-            growth_potential = to_html(city_data.get('growth_potential', ''))
-            infrastructure = to_html(city_data.get('infrastructure', ''))
-            market_trends = to_html(city_data.get('market_trends', ''))
-
             # Cache the data
             city_property = self.search([
                 ('city', '=', city_name),
@@ -433,29 +561,98 @@ class Property(models.Model):
 
             if city_property:
                 city_property.write({
-                    'city_investment_reasons': investment_reasons,
-                    'city_growth_potential': growth_potential,
-                    'city_infrastructure': infrastructure,
-                    'city_market_trends': market_trends,
+                    'city_investment_data': city_data,
                     'city_investment_generated': True,
                     'city_investment_date': fields.Datetime.now(),
                     'last_city_processed': city_name,
                 })
-                _logger.info(f"✅ Cached city data in property ID: {city_property.id}")
+                _logger.debug("Cached %s city data on property %s", city_name, city_property.id)
 
-            return {
-                'city': city_name,
-                'ai_investment_reasons': investment_reasons,
-                'ai_growth_potential': growth_potential,
-                'ai_infrastructure': infrastructure,
-                'ai_market_trends': market_trends,
-                'ai_content_generated': True,
-            }
+            return dict(city_data, city=city_name, ai_content_generated=True)
 
         except Exception as e:
-            _logger.error(f"❌ Error: {e}")
+            _logger.error("City investment generation failed for %s: %s", city_name, e)
             return None
 
+    # -------------------- website --------------------
+    # Fields read by the detail page and by the property cards
+    _DETAIL_PAGE_FIELDS = [
+        'name', 'status', 'price', 'price_per_sqft', 'plot_area', 'registration_amount',
+        'street', 'city', 'state_id', 'category_id', 'facing_direction', 'road_width',
+        'title_status', 'emi_available', 'gated_community', 'water_connection',
+        'electricity_connection', 'drainage_facility', 'nearby_landmarks',
+        'short_description', 'detailed_description', 'contact_name', 'contact_phone',
+        'contact_email', 'seo_title', 'seo_description', 'ai_content_generated', 'ai_content',
+        'gallery_image_ids',
+    ]
+    _CARD_FIELDS = [
+        'name', 'status', 'price', 'price_per_sqft', 'plot_area', 'street', 'city',
+        'zip_code', 'facing_direction', 'contact_phone', 'category_id', 'write_date',
+    ]
+
+    def _get_similar_properties(self, limit=6):
+        """Published properties of the same category, those priced within 20% first"""
+        self.ensure_one()
+        domain = [
+            ('id', '!=', self.id),
+            ('category_id', '=', self.category_id.id),
+            ('is_published', '=', True),
+        ]
+        close = self.search(domain + [
+            ('price', '>=', self.price * 0.8),
+            ('price', '<=', self.price * 1.2),
+        ], limit=limit // 2)
+        others = self.search(domain + [('id', 'not in', close.ids)], limit=limit - len(close))
+        return close | others
+
+    def _prefetch_detail_page(self, similar_properties):
+        """Load everything the detail page renders in a fixed number of queries.
+
+        Without this, the property, its gallery, its state, the similar cards
+        and their categories are each fetched lazily while the template runs.
+        """
+        self.ensure_one()
+        self.fetch(self._DETAIL_PAGE_FIELDS)
+        similar_properties.fetch(self._CARD_FIELDS)
+        self.state_id.fetch(['name'])
+        (self | similar_properties).category_id.fetch(['name', 'write_date'])
+
+    def _render_cards(self, variant):
+        """Render the property cards of a listing section.
+
+        Card markup only changes when the property (or its category) is
+        written, so it is cached per worker under the record's write_date and
+        shared between every page of a website that shows the same card.
+        Editor renderings carry branding attributes and are never cached.
+        """
+        template = CARD_TEMPLATES[variant]
+        QWeb = self.env['ir.qweb']
+        context = self.env.context
+        if context.get('editable') or context.get('inherit_branding'):
+            return Markup('').join(QWeb._render(template, {'prop': prop}) for prop in self)
+        dbname, lang, website_id = self.env.cr.dbname, self.env.lang, context.get('website_id')
+        cards = []
+        for prop in self:
+            key = (dbname, website_id, lang, variant, prop.id, prop.write_date, prop.category_id.write_date)
+            card = _card_cache.get(key)
+            if card is None:
+                card = _card_cache[key] = QWeb._render(template, {'prop': prop})
+            cards.append(card)
+        return Markup('').join(cards)
+
+    def action_auto_assign_agent(self):
+        """Button / list action: assign the best matching agent to unassigned properties"""
+        assignments = self.env['real.estate.agent.matcher'].assign(self)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Agent Assignment'),
+                'message': _('%s properties assigned to agents.', len(assignments)),
+                'type': 'success' if assignments else 'warning',
+            }
+        }
+
     def action_regenerate_ai_content(self):
         """Button to regenerate AI content"""
         for rec in self:
@@ -481,53 +678,6 @@ class Property(models.Model):
                     }
                 }
 
-        # ⭐ ADD THIS COMPUTE METHOD (add after your other compute methods)
-
-    def _compute_status_ribbon_html(self):
-        """Generate status ribbon HTML for use in templates"""
-        for rec in self:
-            if rec.status == 'available':
-                rec.status_ribbon_html = '''
-                       <span class="status-ribbon ribbon-available" 
-                             style="position: absolute; top: 0; right: 0; 
-                                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                                    color: white; padding: 0.5rem 0.9rem; 
-                                    font-size: 11px; font-weight: 700; 
-                                    letter-spacing: 1px; z-index: 10;
-                                    border-radius: 0 0 0 8px;
-                                    box-shadow: 0 3px 12px rgba(0,0,0,0.3);">
-                           <i class="fa fa-check-circle"></i> AVAILABLE
-                       </span>
-                   '''
-            elif rec.status == 'sold':
-                rec.status_ribbon_html = '''
-                       <span class="status-ribbon ribbon-sold" 
-                             style="position: absolute; top: 0; right: 0; 
-                                    background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); 
-                                    color: white; padding: 0.5rem 0.9rem; 
-                                    font-size: 11px; font-weight: 700; 
-                                    letter-spacing: 1px; z-index: 10;
-                                    border-radius: 0 0 0 8px;
-                                    box-shadow: 0 3px 12px rgba(0,0,0,0.3);">
-                           <i class="fa fa-tag"></i> SOLD
-                       </span>
-                   '''
-            elif rec.status == 'rented':
-                rec.status_ribbon_html = '''
-                       <span class="status-ribbon ribbon-rented" 
-                             style="position: absolute; top: 0; right: 0; 
-                                    background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); 
-                                    color: white; padding: 0.5rem 0.9rem; 
-                                    font-size: 11px; font-weight: 700; 
-                                    letter-spacing: 1px; z-index: 10;
-                                    border-radius: 0 0 0 8px;
-                                    box-shadow: 0 3px 12px rgba(0,0,0,0.3);">
-                           <i class="fa fa-key"></i> RENTED
-                       </span>
-                   '''
-            else:
-                rec.status_ribbon_html = ''
-
     # @api.model
     # def get_city_investment_info(self, city_name):
     #     """
@@ -1,4 +1,4 @@
-from odoo import models, fields
+from odoo import models, fields, api, tools
 
 
 class PropertyCategory(models.Model):
@@ -16,3 +16,40 @@ class PropertyCategory(models.Model):
     color = fields.Integer(string='Color', default=0)
 
     property_ids = fields.One2many('property.property', 'category_id', string='Properties')
+
+    # Tag of the form option cache: only bumped when the options change
+    _FORM_OPTIONS_TAG = 'property.category:form_options'
+    _FORM_OPTION_FIELDS = {'name', 'active'}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        categories = super().create(vals_list)
+        self.env['real.estate.cache.tag']._bump([self._name, self._FORM_OPTIONS_TAG])
+        return categories
+
+    def write(self, vals):
+        res = super().write(vals)
+        tags = [self._name]
+        if self._FORM_OPTION_FIELDS & set(vals):
+            tags.append(self._FORM_OPTIONS_TAG)
+        self.env['real.estate.cache.tag']._bump(tags)
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env['real.estate.cache.tag']._bump([self._name, self._FORM_OPTIONS_TAG])
+        return res
+
+    @api.model
+    def _get_form_options(self):
+        """(id, name) pairs for the website form dropdowns, cached until a category is
+        created, deleted or renamed"""
+        tag = self._FORM_OPTIONS_TAG
+        version = self.env['real.estate.cache.tag'].sudo()._get_versions([tag]).get(tag, 0)
+        return self._get_form_options_cached(version)
+
+    @api.model
+    @tools.ormcache('version')
+    def _get_form_options_cached(self, version):
+        # Keyed on the form options tag: a bump makes a new entry, the old one ages out
+        return tuple((cat['id'], cat['name']) for cat in self.sudo().search_read([], ['name']))
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import json
+from datetime import timedelta
+
+from lxml import etree
+
+from odoo import models, fields, api
+from odoo.modules.registry import Registry
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class RealEstatePropertyFeed(models.AbstractModel):
+    """Syndication feed of published listings for aggregator portals.
+
+    The feed is produced as a generator that opens its own cursor and walks
+    the listings in id order, one chunk at a time (keyset pagination), so
+    memory stays flat whatever the number of listings. Images are given as
+    URLs, binaries are never read.
+    """
+    _name = 'real.estate.property.feed'
+    _description = 'Property Syndication Feed'
+
+    CHUNK_SIZE = 1000
+    # write_date is the writer's transaction start: a listing written by a
+    # transaction still running when the feed is read commits with an older
+    # write_date. Incremental feeds re-send this window to catch those rows.
+    SINCE_OVERLAP = timedelta(seconds=60)
+    FEED_FIELDS = [
+        'name', 'status', 'price', 'currency_id', 'plot_area', 'price_per_sqft', 'facing_direction',
+        'title_status', 'road_width', 'short_description', 'street', 'city', 'zip_code', 'state_id',
+        'category_id', 'latitude', 'longitude', 'contact_phone', 'is_published', 'active',
+        'gallery_image_ids', 'ai_content', 'write_date',
+    ]
+
+    @api.model
+    def _iter_chunks(self, since=None):
+        """Yield lists of listing dicts of at most CHUNK_SIZE records.
+
+        A full feed holds published listings. A "changed since" feed holds
+        every listing written after ``since``; unpublished or archived ones
+        are only given as withdrawn ids, so that portals can remove them.
+        """
+        Property = self.env['property.property'].sudo()
+        if since:
+            Property = Property.with_context(active_test=False)
+            domain = [('write_date', '>', since)]
+        else:
+            domain = [('is_published', '=', True)]
+        base_url = self.get_base_url()
+        last_id = 0
+        while True:
+            rows = Property.search_read(domain + [('id', '>', last_id)], self.FEED_FIELDS,
+                                        order='id', limit=self.CHUNK_SIZE)
+            if not rows:
+                return
+            # Cover image checksums for cache-busting URLs, one query per chunk
+            covers = {
+                att['res_id']: att['checksum']
+                for att in self.env['ir.attachment'].sudo().search_read([
+                    ('res_model', '=', 'property.property'), ('res_field', '=', 'image'),
+                    ('res_id', 'in', [row['id'] for row in rows if row['is_published'] and row['active']]),
+                ], ['res_id', 'checksum'])
+            }
+            yield [self._prepare_listing(row, covers.get(row['id']), base_url) for row in rows]
+            last_id = rows[-1]['id']
+            # Drop the chunk from the record cache before reading the next one
+            self.env.invalidate_all()
+
+    @api.model
+    def _prepare_listing(self, row, cover_checksum, base_url):
+        if not (row['is_published'] and row['active']):
+            # Nothing of a withdrawn listing (contact, address, price) leaves the database
+            return {'id': row['id'], 'withdrawn': True}
+        return {
+            'id': row['id'],
+            'url': f"{base_url}/property/{row['id']}",
+            'withdrawn': False,
+            'updated': fields.Datetime.to_string(row['write_date']),
+            'name': row['name'],
+            'status': row['status'],
+            'price': row['price'],
+            'currency': row['currency_id'] and row['currency_id'][1],
+            'plot_area': row['plot_area'],
+            'price_per_sqft': row['price_per_sqft'],
+            'facing_direction': row['facing_direction'],
+            'title_status': row['title_status'],
+            'road_width': row['road_width'],
+            'description': row['short_description'] or '',
+            'street': row['street'] or '',
+            'city': row['city'],
+            'zip_code': row['zip_code'],
+            'state': row['state_id'] and row['state_id'][1],
+            'category': row['category_id'] and row['category_id'][1],
+            'latitude': row['latitude'] or None,
+            'longitude': row['longitude'] or None,
+            'contact_phone': row['contact_phone'],
+            'image_url': cover_checksum and f"{base_url}/web/image/property.property/{row['id']}/image?unique={cover_checksum[:8]}",
+            'highlights': (row['ai_content'] or {}).get('key_highlights', []),
+            'gallery_urls': [f"{base_url}/web/image/ir.attachment/{att_id}/datas" for att_id in row['gallery_image_ids']],
+        }
+
+    # -------------------- serializers --------------------
+    @api.model
+    def _listing_to_xml(self, listing):
+        element = etree.Element('listing', id=str(listing['id']),
+                                withdrawn='true' if listing['withdrawn'] else 'false')
+        for key, value in listing.items():
+            if key in ('id', 'withdrawn') or value is None or value is False or value in ('', []):
+                continue
+            if key == 'gallery_urls':
+                gallery = etree.SubElement(element, 'gallery')
+                for url in value:
+                    etree.SubElement(gallery, 'image').text = url
+            elif key == 'highlights':
+                highlights = etree.SubElement(element, 'highlights')
+                for point in value:
+                    etree.SubElement(highlights, 'highlight').text = point
+            else:
+                etree.SubElement(element, key).text = str(value)
+        return etree.tostring(element, encoding='unicode')
+
+    @api.model
+    def stream(self, fmt='jsonl', since=None):
+        """Return (generated_at, generator of encoded feed pieces) for a format.
+
+        ``generated_at`` is the ``since`` value for the next incremental
+        feed: the start of the current transaction, which precedes the
+        feed's own reads, minus ``SINCE_OVERLAP``. The generator outlives
+        the HTTP request transaction, so it reads through a cursor of its
+        own, opened when iteration starts.
+        """
+        dbname, uid, context = self.env.cr.dbname, self.env.uid, dict(self.env.context)
+        self.env.cr.execute("SELECT now() AT TIME ZONE 'UTC'")
+        [transaction_start] = self.env.cr.fetchone()
+        generated_at = fields.Datetime.to_string(transaction_start - self.SINCE_OVERLAP)
+        since_attr = f' since="{fields.Datetime.to_string(since)}"' if since else ''
+
+        def generate():
+            with Registry(dbname).cursor() as cr:
+                feed = api.Environment(cr, uid, context)[self._name]
+                count = 0
+                if fmt == 'xml':
+                    yield (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+                           f'<listings generated="{generated_at}"{since_attr}>\n').encode()
+                for chunk in feed._iter_chunks(since):
+                    count += len(chunk)
+                    if fmt == 'xml':
+                        yield ''.join(feed._listing_to_xml(listing) + '\n' for listing in chunk).encode()
+                    else:
+                        yield ''.join(json.dumps(listing) + '\n' for listing in chunk).encode()
+                if fmt == 'xml':
+                    yield b'</listings>\n'
+                _logger.info("Property feed (%s) streamed %s listings", fmt, count)
+
+        return generated_at, generate()
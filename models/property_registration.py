@@ -2,6 +2,9 @@
 from odoo import models, fields, api
 from odoo.exceptions import UserError
 
+from .. import instrumentation
+
+
 class PropertyRegistration(models.Model):
     _name = 'property.registration'
     _description = 'Property Registration'
@@ -92,7 +95,9 @@ class PropertyRegistration(models.Model):
                 #     # No mail template found, just show warning
                 #     raise UserError(_("Rejection mail template not found. Please create it."))
                 #
+    @instrumentation.instrument
     def action_approve(self):
+        created_properties = self.env['property.property']
         for rec in self:
             if rec.status == 'approved':
                 raise UserError("Already approved.")
@@ -158,23 +163,30 @@ class PropertyRegistration(models.Model):
                 attach.copy({'res_model': 'property.property', 'res_id': property_obj.id})
 
             rec.status = 'approved'
+            created_properties |= property_obj
+
+        # Route the new listings to agents in one batch
+        self.env['real.estate.agent.matcher'].assign(created_properties)
 
     def action_reject(self):
-        """When rejected, send a rejection email to the user"""
-        for record in self:
-            record.status = 'rejected'
-
-            # ✅ Send email only if user email exists
-            if record.create_uid and record.create_uid.email:
-                mail_template = self.env.ref('real_estate_management.mail_template_property_rejection',
-                                             raise_if_not_found=False)
-                if mail_template:
-                    mail_template.send_mail(record.id, force_send=True)
-                else:
-                    # fallback message in chatter
-                    record.message_post(
-                        body=f"Rejection mail template not found, but property '{record.name}' was rejected.",
-                    )
+        """Reject in one write and queue the rejection emails for the mail cron"""
+        self.write({'status': 'rejected'})
+
+        # ✅ Send email only if we have an address for the customer
+        to_notify = self.filtered(lambda r: r.email or (r.create_uid and r.create_uid.email))
+        if not to_notify:
+            return
+        mail_template = self.env.ref('real_estate_management.mail_template_property_rejection',
+                                     raise_if_not_found=False)
+        if mail_template:
+            # Rendered in one pass; mail.mail records wait in the outgoing queue
+            mail_template.send_mail_batch(to_notify.ids)
+        else:
+            # fallback message in chatter
+            for record in to_notify:
+                record.message_post(
+                    body=f"Rejection mail template not found, but property '{record.property_name}' was rejected.",
+                )
 
         # ❌ Reject Button
     # def action_reject(self):
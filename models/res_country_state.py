@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from odoo import models, api, tools
+
+
+class ResCountryState(models.Model):
+    _inherit = 'res.country.state'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        states = super().create(vals_list)
+        self.env['real.estate.cache.tag']._bump([self._name])
+        return states
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {'name', 'country_id'} & set(vals):
+            self.env['real.estate.cache.tag']._bump([self._name])
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env['real.estate.cache.tag']._bump([self._name])
+        return res
+
+    @api.model
+    def _get_form_options(self, country_id):
+        """(id, name) pairs of a country's states for the website form dropdowns"""
+        version = self.env['real.estate.cache.tag'].sudo()._get_versions([self._name]).get(self._name, 0)
+        return self._get_form_options_cached(country_id, version)
+
+    @api.model
+    @tools.ormcache('country_id', 'version')
+    def _get_form_options_cached(self, country_id, version):
+        return tuple(
+            (state['id'], state['name'])
+            for state in self.sudo().search_read([('country_id', '=', country_id)], ['name'], order='name')
+        )
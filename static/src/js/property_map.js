@@ -208,7 +208,74 @@ function initPropertyMap() {
             map.setView([20.5937, 78.9629], 5);
         }
 
-        // 6) Ensure layout effects are applied
+        // 6) Optional price per sq.ft heat layer, binned server-side per zoom level
+        const heatLayer = L.layerGroup();
+        const heatCache = {};
+        const selectedCity = dataEl.dataset.city || '';
+
+        function heatColor(value, min, max) {
+            // green (cheap) -> red (expensive)
+            const ratio = max > min ? (value - min) / (max - min) : 0.5;
+            return `hsl(${Math.round(120 * (1 - ratio))}, 80%, 45%)`;
+        }
+
+        function drawHeatLayer(data) {
+            heatLayer.clearLayers();
+            const medians = data.cells.map((cell) => cell.median).sort((a, b) => a - b);
+            if (!medians.length) {
+                return;
+            }
+            // Color on the 5th-95th percentile range so outliers do not flatten the scale
+            const min = medians[Math.floor((medians.length - 1) * 0.05)];
+            const max = medians[Math.floor((medians.length - 1) * 0.95)];
+            data.cells.forEach((cell) => {
+                const value = Math.min(Math.max(cell.median, min), max);
+                L.rectangle([[cell.south, cell.west], [cell.north, cell.east]], {
+                    stroke: false,
+                    fillColor: heatColor(value, min, max),
+                    fillOpacity: 0.45,
+                    interactive: true,
+                }).bindTooltip(
+                    `₹${Math.round(cell.median).toLocaleString('en-IN')}/sqft median` +
+                    ` · ₹${Math.round(cell.mean).toLocaleString('en-IN')} mean` +
+                    ` · ${cell.count} ${cell.count === 1 ? 'listing' : 'listings'}`
+                ).addTo(heatLayer);
+            });
+        }
+
+        function refreshHeatLayer() {
+            if (!map.hasLayer(heatLayer)) {
+                return;
+            }
+            const zoom = map.getZoom();
+            if (heatCache[zoom]) {
+                drawHeatLayer(heatCache[zoom]);
+                return;
+            }
+            const params = new URLSearchParams({ zoom: String(zoom) });
+            if (selectedCity) {
+                params.set('city', selectedCity);
+            }
+            fetch(`/properties/heatmap?${params}`)
+                .then((response) => (response.ok ? response.json() : Promise.reject(response.status)))
+                .then((data) => {
+                    heatCache[zoom] = data;
+                    if (map.getZoom() === zoom) {
+                        drawHeatLayer(data);
+                    }
+                })
+                .catch((e) => console.warn('Property map: heatmap unavailable', e));
+        }
+
+        L.control.layers(null, { 'Price / sq.ft heatmap': heatLayer }, { collapsed: false }).addTo(map);
+        map.on('overlayadd', (ev) => {
+            if (ev.layer === heatLayer) {
+                refreshHeatLayer();
+            }
+        });
+        map.on('zoomend', refreshHeatLayer);
+
+        // 7) Ensure layout effects are applied
         setTimeout(() => {
             map.invalidateSize();
         }, 300);
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from odoo.sql_db import Cursor
+from odoo.tests import HttpCase
+
+from ..controllers.page_cache import page_cache
+from ..models.property import _card_cache
+
+_logger = logging.getLogger(__name__)
+
+MODULE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RealEstateQueryCase(HttpCase):
+    """Measures the SQL statements issued by website and portal routes on a
+    generated catalogue, with the per-worker page caches out of the way."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Detail pages generate missing AI content: answer it locally
+        ICP = cls.env['ir.config_parameter'].sudo()
+        ICP.set_param('real_estate_management.ai_provider', 'stub')
+        ICP.set_param('real_estate_management.ai_stub_latency_ms', '0')
+
+    def _generate_catalogue(self, count, gallery_images=0, seed=0):
+        return self.env['real.estate.benchmark']._generate_catalogue(count, gallery_images=gallery_images, seed=seed)
+
+    @contextmanager
+    def _record_queries(self):
+        """Collect ``(query, stack)`` for every statement executed meanwhile.
+
+        The profiler's SQL collector only hooks the thread that starts it,
+        while HttpCase requests are served by the server thread: record at
+        the cursor instead."""
+        queries = []
+        execute = Cursor.execute
+
+        def recording_execute(cr, query, *args, **kwargs):
+            queries.append((str(query), traceback.extract_stack()[:-1]))
+            return execute(cr, query, *args, **kwargs)
+
+        with patch.object(Cursor, 'execute', recording_execute):
+            yield queries
+
+    @staticmethod
+    def _query_origins(queries):
+        """Group queries by the innermost frame of this module that issued them."""
+        origins = Counter()
+        samples = {}
+        for query, stack in queries:
+            origin = next((
+                f"{os.path.relpath(frame.filename, MODULE_DIR)}:{frame.lineno} in {frame.name}"
+                for frame in reversed(stack)
+                if frame.filename.startswith(MODULE_DIR) and os.sep + 'tests' + os.sep not in frame.filename
+            ), "(framework)")
+            origins[origin] += 1
+            samples.setdefault(origin, ' '.join(query.split())[:120])
+        return '\n'.join(
+            f"  {count:4d} x {origin}: {samples[origin]}"
+            for origin, count in origins.most_common()
+        )
+
+    def _count_route_queries(self, url, budget):
+        """Request ``url`` warm but with the page and card caches cleared, and
+        return the number of SQL statements it issued, failing above ``budget``
+        with the queries grouped by origin."""
+        # Warm-up: registry caches, listing snapshot, AI content
+        self.url_open(url)
+        page_cache.clear()
+        _card_cache.clear()
+        with self._record_queries() as queries:
+            try:
+                with self.assertQueryCount(budget):
+                    count = self.cr.sql_log_count
+                    start = time.perf_counter()
+                    response = self.url_open(url)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    count = self.cr.sql_log_count - count
+            except AssertionError as e:
+                raise AssertionError(
+                    f"{url} took {elapsed:.0f}ms: {e}\n{self._query_origins(queries)}"
+                ) from None
+        _logger.info("%s: %d queries in %.0fms (budget: %d)", url, count, elapsed, budget)
+        self.assertEqual(response.status_code, 200)
+        return count
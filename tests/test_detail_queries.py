@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import tagged
+
+from .common import RealEstateQueryCase
+
+# SQL statements allowed for a detail page, whatever the size of its gallery
+DETAIL_PAGE_BUDGET = 30
+GALLERY_SIZES = (0, 3, 10)
+
+
+@tagged('post_install', '-at_install')
+class TestDetailQueries(RealEstateQueryCase):
+
+    def test_detail_queries_do_not_grow_with_gallery(self):
+        counts = {}
+        for size in GALLERY_SIZES:
+            self._generate_catalogue(5, gallery_images=size, seed=size)
+            prop = self.env['property.property'].search([('is_published', '=', True)], order='id desc', limit=1)
+            self.assertEqual(len(prop.gallery_image_ids), size)
+            with self.subTest(gallery=size):
+                counts[size] = self._count_route_queries(f'/property/{prop.id}', DETAIL_PAGE_BUDGET)
+        self.assertEqual(len(set(counts.values())), 1, f"Detail page queries per gallery size: {counts}")
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import new_test_user, tagged
+
+from .common import RealEstateQueryCase
+
+# SQL statements allowed per request, rendering included. Counts must hold
+# whatever the catalogue size, so every route is measured on each catalogue
+# size against the same budget.
+PUBLIC_ROUTE_BUDGETS = [
+    ('/', 30),
+    ('/?city=Hyderabad', 30),
+    ('/properties', 20),
+    ('/properties?search=Hyderabad', 20),
+    ('/property/{property_id}', 30),
+    ('/property/register', 5),
+    ('/agent/{agent_id}', 12),
+    ('/agent/register', 8),
+]
+AGENT_ROUTE_BUDGETS = [
+    ('/agents', 15),
+    ('/my/agent/dashboard', 15),
+    ('/my/agent/profile', 10),
+    ('/my/agent/properties', 12),
+    ('/my/agent/property/add', 10),
+    ('/my/agent/property/{property_id}', 12),
+]
+CATALOGUE_SIZES = (20, 200)
+
+
+@tagged('post_install', '-at_install')
+class TestRouteBudgets(RealEstateQueryCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.agent_user = new_test_user(cls.env, login='budget.agent', groups='base.group_portal')
+
+    def _assert_route_budgets(self, routes, **params):
+        for path, budget in routes:
+            url = path.format(**params)
+            with self.subTest(url=url):
+                self._count_route_queries(url, budget)
+
+    def test_route_budgets(self):
+        agent = self.env['real.estate.agent']
+        generated = 0
+        for size in CATALOGUE_SIZES:
+            self._generate_catalogue(size - generated, gallery_images=2, seed=size)
+            generated = size
+            if not agent:
+                agent = agent.search([('property_ids.is_published', '=', True)], limit=1)
+                agent.user_id = self.agent_user
+            params = {
+                'agent_id': agent.id,
+                'property_id': agent.property_ids.filtered('is_published')[:1].id,
+            }
+
+            with self.subTest(catalogue=size):
+                self.authenticate(None, None)
+                self._assert_route_budgets(PUBLIC_ROUTE_BUDGETS, **params)
+                self.authenticate('budget.agent', 'budget.agent')
+                self._assert_route_budgets(AGENT_ROUTE_BUDGETS, **params)
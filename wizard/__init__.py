@@ -1 +1,2 @@
-from . import agent_registration_reject_wizard
\ No newline at end of file
+from . import agent_registration_reject_wizard
+from . import property_import_wizard
@@ -1,32 +1,61 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, _
+from markupsafe import Markup
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
 
 
 class AgentRegistrationRejectWizard(models.TransientModel):
     _name = 'agent.registration.reject.wizard'
     _description = 'Reject Agent Registration'
 
-    registration_id = fields.Many2one('agent.registration', required=True)
+    registration_ids = fields.Many2many('agent.registration', string='Registrations', required=True)
+    registration_count = fields.Integer(compute='_compute_registration_count')
     rejection_reason = fields.Text(string='Rejection Reason', required=True)
 
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        context = self.env.context
+        if ('registration_ids' in fields_list and not res.get('registration_ids')
+                and context.get('active_model') == 'agent.registration' and context.get('active_ids')):
+            res['registration_ids'] = [(6, 0, context['active_ids'])]
+        return res
+
+    @api.depends('registration_ids')
+    def _compute_registration_count(self):
+        for wizard in self:
+            wizard.registration_count = len(wizard.registration_ids)
+
     def action_confirm_reject(self):
         self.ensure_one()
-        self.registration_id.write({
+        registrations = self.registration_ids.filtered(lambda r: r.status != 'rejected')
+        if not registrations:
+            raise UserError(_("The selected registrations are already rejected."))
+
+        # One grouped UPDATE; field tracking would post one message per record,
+        # the batched log below records the same information instead
+        registrations.with_context(mail_notrack=True).write({
             'status': 'rejected',
             'rejection_reason': self.rejection_reason,
             'reviewed_by': self.env.user.id,
             'review_date': fields.Datetime.now(),
         })
-        self.registration_id.message_post(
-            body=f"❌ Rejected by {self.env.user.name}: {self.rejection_reason}",
-            message_type='notification'
+
+        # All chatter entries in a single mail.message insert
+        body = Markup("❌ Rejected by %s: %s") % (self.env.user.name, self.rejection_reason)
+        registrations._message_log_batch(
+            bodies=dict.fromkeys(registrations.ids, body),
+            author_id=self.env.user.partner_id.id,
+            message_type='notification',
         )
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
                 'title': 'Rejected',
-                'message': 'Registration rejected.',
+                'message': f'{len(registrations)} registration(s) rejected.',
                 'type': 'warning',
+                'next': {'type': 'ir.actions.act_window_close'},
             }
         }
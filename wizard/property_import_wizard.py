@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+import base64
+import csv
+import io
+import logging
+import time
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools import split_every
+
+try:
+    from openpyxl import load_workbook
+except ImportError:
+    load_workbook = None
+
+_logger = logging.getLogger(__name__)
+
+# Spreadsheet columns, by type. Headers are field names (category and state by name)
+CHAR_COLUMNS = (
+    'name', 'short_description', 'street', 'street2', 'city', 'zip_code',
+    'contact_name', 'contact_phone', 'contact_email', 'seo_title', 'seo_description',
+    'nearby_landmarks', 'property_website_url',
+)
+FLOAT_COLUMNS = ('price', 'plot_area', 'road_width', 'registration_charges')
+BOOLEAN_COLUMNS = (
+    'emi_available', 'water_connection', 'electricity_connection', 'drainage_facility',
+    'gated_community', 'is_published', 'is_featured',
+)
+SELECTION_COLUMNS = ('facing_direction', 'title_status', 'status')
+REQUIRED_COLUMNS = (
+    'name', 'price', 'plot_area', 'city', 'zip_code', 'state', 'facing_direction',
+    'road_width', 'title_status', 'contact_name', 'contact_phone', 'contact_email',
+    'seo_title', 'nearby_landmarks',
+)
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'x'}
+
+MAX_REPORTED_ERRORS = 1000
+
+
+class PropertyImportWizard(models.TransientModel):
+    """Bulk property import for builder spreadsheets.
+
+    The file is read row by row, rows are validated against lookups loaded
+    once (categories, states, selection values) and created in batches with
+    mail tracking disabled. Geocoding is left to a cron, so a large import is
+    bound by the ORM inserts alone.
+    """
+    _name = 'property.import.wizard'
+    _description = 'Bulk Property Import'
+
+    BATCH_SIZE = 500
+    PROGRESS_INTERVAL = 10  # seconds between progress notifications
+
+    file = fields.Binary(string='File', required=True)
+    filename = fields.Char(string='File Name')
+    auto_assign_agents = fields.Boolean(string='Auto-assign Agents', default=True)
+    publish = fields.Boolean(string='Publish Imported Properties',
+                             help='Used for rows without an is_published column')
+    state = fields.Selection([('upload', 'Upload'), ('done', 'Done')], default='upload')
+    imported_count = fields.Integer(string='Imported', readonly=True)
+    error_count = fields.Integer(string='Rows with Errors', readonly=True)
+    error_log = fields.Text(string='Errors', readonly=True)
+
+    # -------------------- reading --------------------
+    def _read_rows(self):
+        """Yield (line number, {header: value}) for each non-empty row of the file"""
+        content = base64.b64decode(self.file)
+        filename = (self.filename or '').lower()
+        if filename.endswith('.xlsx'):
+            if load_workbook is None:
+                raise UserError(_("Reading .xlsx files requires the openpyxl library, please upload a CSV file."))
+            sheet = load_workbook(io.BytesIO(content), read_only=True, data_only=True).active
+            rows = sheet.iter_rows(values_only=True)
+            header = [str(cell or '').strip().lower() for cell in next(rows, ())]
+            for line, row in enumerate(rows, start=2):
+                if any(cell not in (None, '') for cell in row):
+                    yield line, dict(zip(header, row))
+        elif filename.endswith('.csv'):
+            reader = csv.DictReader(io.TextIOWrapper(io.BytesIO(content), encoding='utf-8-sig', newline=''))
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+            for line, row in enumerate(reader, start=2):
+                if any(row.values()):
+                    yield line, row
+        else:
+            raise UserError(_("Please upload a .csv or .xlsx file."))
+
+    # -------------------- validation --------------------
+    def _load_lookups(self):
+        """Name -> id maps for the relational and selection columns"""
+        Property = self.env['property.property']
+        country = self.env.company.country_id or self.env.ref('base.in')
+        states = {}
+        for state in self.env['res.country.state'].sudo().search_read(
+                [('country_id', '=', country.id)], ['name', 'code']):
+            states[state['name'].lower()] = states[state['code'].lower()] = state['id']
+        selections = {}
+        for fname in SELECTION_COLUMNS:
+            selection = selections[fname] = {}
+            for key, label in Property._fields[fname].selection:
+                selection[key.lower()] = selection[label.lower()] = key
+        return {
+            'country_id': country.id,
+            'categories': {name.lower(): cid for cid, name in self.env['property.category']._get_form_options()},
+            'states': states,
+            'selections': selections,
+            'publish': self.publish,
+        }
+
+    def _parse_row(self, row, lookups):
+        """Return create values for a row, raise ValueError with a readable message"""
+        row = {key: str(value).strip() if value is not None else '' for key, value in row.items() if key}
+        missing = [column for column in REQUIRED_COLUMNS if not row.get(column)]
+        if missing:
+            raise ValueError(_("missing %s", ', '.join(missing)))
+
+        vals = {column: row[column] for column in CHAR_COLUMNS if row.get(column)}
+        for column in FLOAT_COLUMNS:
+            if row.get(column):
+                try:
+                    vals[column] = float(row[column].replace(',', ''))
+                except ValueError:
+                    raise ValueError(_("%(column)s is not a number: %(value)s", column=column, value=row[column]))
+        for column in BOOLEAN_COLUMNS:
+            if row.get(column):
+                vals[column] = row[column].lower() in TRUE_VALUES
+        for column in SELECTION_COLUMNS:
+            if row.get(column):
+                value = lookups['selections'][column].get(row[column].lower())
+                if not value:
+                    raise ValueError(_("unknown %(column)s: %(value)s", column=column, value=row[column]))
+                vals[column] = value
+
+        vals['state_id'] = lookups['states'].get(row['state'].lower())
+        if not vals['state_id']:
+            raise ValueError(_("unknown state: %s", row['state']))
+        if row.get('category'):
+            vals['category_id'] = lookups['categories'].get(row['category'].lower())
+            if not vals['category_id']:
+                raise ValueError(_("unknown category: %s", row['category']))
+
+        vals['country_id'] = lookups['country_id']
+        vals.setdefault('is_published', lookups['publish'])
+        vals['geolocation_pending'] = True
+        return vals
+
+    # -------------------- import --------------------
+    def _create_batch(self, Property, batch, errors):
+        """Create one batch, falling back to row by row to isolate failing rows"""
+        try:
+            with self.env.cr.savepoint():
+                return Property.create([vals for _line, vals in batch])
+        except Exception:
+            _logger.info("Batch create failed, retrying %s rows one by one", len(batch))
+        created = Property
+        for line, vals in batch:
+            try:
+                with self.env.cr.savepoint():
+                    created |= Property.create(vals)
+            except Exception as e:
+                errors.append((line, (str(e).splitlines() or [repr(e)])[0]))
+        return created
+
+    def _notify_progress(self, imported, rejected, started):
+        """Show the importing user how far the import got. The import runs in
+        a single transaction, so the notification goes through a cursor of
+        its own to reach the browser while the import is still running."""
+        message = _("%(imported)s properties imported, %(rejected)s rows rejected so far (%(seconds)ss)",
+                    imported=imported, rejected=rejected, seconds=int(time.monotonic() - started))
+        try:
+            with self.env.registry.cursor() as cr:
+                env = api.Environment(cr, self.env.uid, self.env.context)
+                env['bus.bus']._sendone(env.user.partner_id, 'simple_notification', {
+                    'type': 'info',
+                    'title': _("Importing properties"),
+                    'message': message,
+                    'sticky': False,
+                })
+        except Exception:
+            _logger.warning("Could not send import progress", exc_info=True)
+
+    def action_import(self):
+        self.ensure_one()
+        started = time.monotonic()
+        lookups = self._load_lookups()
+        Property = self.env['property.property'].with_context(
+            tracking_disable=True, mail_create_nolog=True, mail_create_nosubscribe=True)
+        Matcher = self.env['real.estate.agent.matcher']
+        auto_assign = self.auto_assign_agents
+
+        imported, errors = 0, []
+        notified_at = started
+        for chunk in split_every(self.BATCH_SIZE, self._read_rows()):
+            batch = []
+            for line, row in chunk:
+                try:
+                    batch.append((line, self._parse_row(row, lookups)))
+                except ValueError as e:
+                    errors.append((line, str(e)))
+            if not batch:
+                continue
+            properties = self._create_batch(Property, batch, errors)
+            if auto_assign:
+                Matcher.assign(properties)
+            imported += len(properties)
+            # Keep memory flat over large files
+            self.env.flush_all()
+            self.env.invalidate_all()
+            _logger.info("Property import: %s rows imported, %s errors (%.1fs)",
+                         imported, len(errors), time.monotonic() - started)
+            if time.monotonic() - notified_at >= self.PROGRESS_INTERVAL:
+                self._notify_progress(imported, len(errors), started)
+                notified_at = time.monotonic()
+
+        errors.sort()
+        error_lines = [_("Row %(line)s: %(error)s", line=line, error=error)
+                       for line, error in errors[:MAX_REPORTED_ERRORS]]
+        if len(errors) > MAX_REPORTED_ERRORS:
+            error_lines.append(_("... and %s more", len(errors) - MAX_REPORTED_ERRORS))
+        self.write({
+            'state': 'done',
+            'imported_count': imported,
+            'error_count': len(errors),
+            'error_log': '\n'.join(error_lines),
+        })
+        _logger.info("Imported %s properties in %.1fs, %s rows rejected",
+                     imported, time.monotonic() - started, len(errors))
+        if imported:
+            # Start geocoding now rather than at the next scheduled run
+            self.env.ref('real_estate_management.ir_cron_geocode_pending_properties').sudo()._trigger()
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }